@@ -0,0 +1,26 @@
+"""partial index on active carts
+
+Revision ID: 032c13d1b1d2
+Revises: 0b8223e49353
+Create Date: 2026-10-19 17:42:08.311204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '032c13d1b1d2'
+down_revision = '0b8223e49353'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_cart_user_id_active', 'cart', ['user_id'], unique=False,
+                    postgresql_where=sa.text('status'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_cart_user_id_active', table_name='cart',
+                  postgresql_where=sa.text('status'))
@@ -0,0 +1,44 @@
+"""unique cart product per user
+
+Revision ID: 0b8223e49353
+Revises: ced41d99a27f
+Create Date: 2026-10-19 13:02:17.548903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b8223e49353'
+down_revision = 'ced41d99a27f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Merge duplicated lines into the oldest one before adding the constraint
+    op.execute(
+        """
+        UPDATE cart SET total_count = d.total_count, total_price = d.total_price
+        FROM (
+            SELECT min(id) AS id, sum(total_count) AS total_count, sum(total_price) AS total_price
+            FROM cart GROUP BY user_id, product_id, status HAVING count(*) > 1
+        ) AS d
+        WHERE cart.id = d.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM cart USING cart AS kept
+        WHERE cart.user_id = kept.user_id
+          AND cart.product_id = kept.product_id
+          AND cart.status = kept.status
+          AND cart.id > kept.id
+        """
+    )
+    op.create_unique_constraint(op.f('uq_cart_user_id'), 'cart', ['user_id', 'product_id', 'status'])
+
+
+def downgrade() -> None:
+    op.drop_constraint(op.f('uq_cart_user_id'), 'cart', type_='unique')
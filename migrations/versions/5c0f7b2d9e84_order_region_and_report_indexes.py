@@ -0,0 +1,39 @@
+"""order region and report indexes
+
+Revision ID: 5c0f7b2d9e84
+Revises: e3a61c5f0b27
+Create Date: 2026-10-19 20:31:06.482917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c0f7b2d9e84'
+down_revision = 'e3a61c5f0b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('order', sa.Column('region', sa.String(length=100), nullable=True))
+    op.add_column('order', sa.Column('district', sa.String(length=100), nullable=True))
+    op.create_index('ix_order_created_at', 'order', ['created_at'], unique=False,
+                    postgresql_include=['total_price', 'region', 'district'])
+
+    op.add_column('order_item', sa.Column('created_at', sa.DateTime(), nullable=True))
+    op.execute('UPDATE order_item SET created_at = "order".created_at FROM "order" WHERE "order".id = order_item.order_id')
+    op.alter_column('order_item', 'created_at', existing_type=sa.DateTime(), nullable=False)
+    op.create_index('ix_order_item_created_at', 'order_item', ['created_at'], unique=False,
+                    postgresql_include=['product_id', 'count', 'unit_price'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_order_item_created_at', table_name='order_item',
+                  postgresql_include=['product_id', 'count', 'unit_price'])
+    op.drop_column('order_item', 'created_at')
+    op.drop_index('ix_order_created_at', table_name='order',
+                  postgresql_include=['total_price', 'region', 'district'])
+    op.drop_column('order', 'district')
+    op.drop_column('order', 'region')
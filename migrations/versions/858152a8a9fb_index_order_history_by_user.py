@@ -0,0 +1,24 @@
+"""index order history by user
+
+Revision ID: 858152a8a9fb
+Revises: 032c13d1b1d2
+Create Date: 2026-10-19 18:21:37.904116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '858152a8a9fb'
+down_revision = '032c13d1b1d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_order_user_id_id', 'order', ['user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_order_user_id_id', table_name='order')
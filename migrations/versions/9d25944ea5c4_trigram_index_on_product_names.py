@@ -0,0 +1,29 @@
+"""trigram index on product names
+
+Revision ID: 9d25944ea5c4
+Revises: 858152a8a9fb
+Create Date: 2026-10-19 19:04:52.117630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d25944ea5c4'
+down_revision = '858152a8a9fb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Creating the extension needs a superuser or the database owner on PG 13+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_product_product_name_trgm', 'product', ['product_name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'product_name': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_product_name_trgm', table_name='product',
+                  postgresql_using='gin', postgresql_ops={'product_name': 'gin_trgm_ops'})
+    # The extension is left installed, other objects may use it
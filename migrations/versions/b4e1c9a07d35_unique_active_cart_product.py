@@ -0,0 +1,49 @@
+"""unique active cart product
+
+Revision ID: b4e1c9a07d35
+Revises: 5c0f7b2d9e84
+Create Date: 2026-10-19 21:14:52.306118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e1c9a07d35'
+down_revision = '5c0f7b2d9e84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Only active lines are merged, ordered lines of the same product may repeat
+    op.drop_constraint('uq_cart_user_id', 'cart', type_='unique')
+    op.create_index('uq_cart_user_id_product_id_active', 'cart', ['user_id', 'product_id'], unique=True,
+                    postgresql_where=sa.text('status'))
+
+
+def downgrade() -> None:
+    op.drop_index('uq_cart_user_id_product_id_active', table_name='cart',
+                  postgresql_where=sa.text('status'))
+    # Merge repeated ordered lines into the oldest one before adding the constraint back
+    op.execute(
+        """
+        UPDATE cart SET total_count = d.total_count, total_price = d.total_price
+        FROM (
+            SELECT min(id) AS id, sum(total_count) AS total_count, sum(total_price) AS total_price
+            FROM cart GROUP BY user_id, product_id, status HAVING count(*) > 1
+        ) AS d
+        WHERE cart.id = d.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM cart USING cart AS kept
+        WHERE cart.user_id = kept.user_id
+          AND cart.product_id = kept.product_id
+          AND cart.status = kept.status
+          AND cart.id > kept.id
+        """
+    )
+    op.create_unique_constraint('uq_cart_user_id', 'cart', ['user_id', 'product_id', 'status'])
@@ -0,0 +1,38 @@
+"""added order status and courier
+
+Revision ID: ced41d99a27f
+Revises: 0436a38ed804
+Create Date: 2026-10-19 12:10:41.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ced41d99a27f'
+down_revision = '0436a38ed804'
+branch_labels = None
+depends_on = None
+
+order_status = sa.Enum('PENDING', 'ACCEPTED', name='orderstatus')
+
+
+def upgrade() -> None:
+    order_status.create(op.get_bind())
+    op.alter_column('order', 'status',
+               existing_type=sa.Boolean(),
+               type_=order_status,
+               existing_nullable=False,
+               postgresql_using="'PENDING'::orderstatus")
+    op.add_column('order', sa.Column('courier_id', sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('order', 'courier_id')
+    op.alter_column('order', 'status',
+               existing_type=order_status,
+               type_=sa.Boolean(),
+               existing_nullable=False,
+               postgresql_using="status = 'PENDING'")
+    order_status.drop(op.get_bind())
@@ -0,0 +1,39 @@
+"""order items with price snapshot
+
+Revision ID: e3a61c5f0b27
+Revises: 9d25944ea5c4
+Create Date: 2026-10-19 19:47:25.630418
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a61c5f0b27'
+down_revision = '9d25944ea5c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('order_item',
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=True),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('unit_price', sa.Numeric(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['order.id'], name=op.f('fk_order_item_order_id_order'), ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['product.id'], name=op.f('fk_order_item_product_id_product'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_order_item'))
+    )
+    op.create_index('ix_order_item_order_id', 'order_item', ['order_id'], unique=False)
+    op.create_index('ix_order_item_product_id', 'order_item', ['product_id'], unique=False,
+                    postgresql_include=['count', 'unit_price'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_order_item_product_id', table_name='order_item',
+                  postgresql_include=['count', 'unit_price'])
+    op.drop_index('ix_order_item_order_id', table_name='order_item')
+    op.drop_table('order_item')
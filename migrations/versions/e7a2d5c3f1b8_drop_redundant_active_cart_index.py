@@ -0,0 +1,27 @@
+"""drop redundant active cart index
+
+Revision ID: e7a2d5c3f1b8
+Revises: b4e1c9a07d35
+Create Date: 2026-10-19 21:38:25.917340
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a2d5c3f1b8'
+down_revision = 'b4e1c9a07d35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # uq_cart_user_id_product_id_active starts with user_id and has the same predicate
+    op.drop_index('ix_cart_user_id_active', table_name='cart',
+                  postgresql_where=sa.text('status'))
+
+
+def downgrade() -> None:
+    op.create_index('ix_cart_user_id_active', 'cart', ['user_id'], unique=False,
+                    postgresql_where=sa.text('status'))
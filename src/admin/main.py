@@ -7,6 +7,8 @@ from .auth import AdminAuth
 from .settings import engine
 from ..configuration import conf
 
+conf.create_media_dirs()
+
 app = FastAPI()
 authentication_backend = AdminAuth(secret_key=conf.SECRET_KEY)
 admin = Admin(app=app, engine=engine, authentication_backend=authentication_backend, templates_dir='src/admin/templates')
@@ -4,11 +4,14 @@ import logging
 
 from aiogram import Bot
 from aiogram.client.default import DefaultBotProperties
-from redis.asyncio.client import Redis
 
 from src.bot.dispatcher import get_dispatcher, get_redis_storage
+from src.bot.middlewares.send_queue_md import SendQueueMiddleware
 from src.bot.structures.data_structure import TransferData
+from src.bot.utils.order_notifier import OrderNotifier
 from src.cache import Cache
+from src.cache.adapter import build_redis_client
+from src.cache.pool import build_connection_pool, report_pool_usage
 from src.configuration import conf
 from src.db.database import create_async_engine
 from src.language.translator import Translator
@@ -16,29 +19,41 @@ from src.language.translator import Translator
 async def start_bot():
     """This function will start bot with polling mode."""
     bot = Bot(token=conf.bot.token, default=DefaultBotProperties(parse_mode='html'))
-    cache = Cache()
-    storage = get_redis_storage(
-        redis=Redis(
-            db=conf.redis.db,
-            host=conf.redis.host,
-            password=conf.redis.passwd,
-            username=conf.redis.username,
-            port=conf.redis.port,
-        )
-    )
+    send_queue = SendQueueMiddleware()
+    bot.session.middleware(send_queue)
+    pool = build_connection_pool()
+    redis = build_redis_client(pool)
+    await redis.ping()
+    cache = Cache(redis=redis)
+    storage = get_redis_storage(redis=redis)
     dp = get_dispatcher(storage=storage)
 
-    await dp.start_polling(
-        bot,
-        allowed_updates=dp.resolve_used_update_types(),
-        **TransferData(
-            engine=create_async_engine(url=conf.db.build_connection_str()),
-            cache=cache
-        ),
-        translator=Translator(), 
-
+    order_notifier = OrderNotifier(redis=redis)
+    background_tasks = (
+        asyncio.create_task(order_notifier.run(bot)),
+        asyncio.create_task(cache.listen_invalidations()),
+        asyncio.create_task(report_pool_usage(pool)),
     )
 
+    try:
+        await dp.start_polling(
+            bot,
+            allowed_updates=dp.resolve_used_update_types(),
+            **TransferData(
+                engine=create_async_engine(url=conf.db.build_connection_str()),
+                cache=cache,
+                order_notifier=order_notifier,
+            ),
+            translator=Translator(), 
+
+        )
+    finally:
+        await send_queue.close()
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        await pool.disconnect()
+
 
 if __name__ == '__main__':
     logging.basicConfig(level=conf.logging_level)
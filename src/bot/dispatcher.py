@@ -3,10 +3,10 @@
 from aiogram import Dispatcher
 from aiogram.fsm.storage.base import BaseEventIsolation, BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
-from aiogram.fsm.storage.redis import RedisStorage
 from aiogram.fsm.strategy import FSMStrategy
 from redis.asyncio.client import Redis
 
+from src.cache.storage import CodecRedisStorage
 from src.configuration import conf
 from src.bot.middlewares.database_md import DatabaseMiddleware
 from src.bot.middlewares.translator_md import TranslatorMiddleware
@@ -19,6 +19,8 @@ def get_redis_storage(
 ):
     """This function create redis storage or get it forcely from configuration.
 
+    FSM data is stored with the compact `fsm_codec`.
+
     :param redis: Redis client instance
     :param state_ttl: FSM State Time-To-Delete timer in seconds (has effect only
     for Redis database)
@@ -26,7 +28,7 @@ def get_redis_storage(
     for Redis database)
     :return: Created Redis storage.
     """
-    return RedisStorage(redis=redis, state_ttl=state_ttl, data_ttl=data_ttl)
+    return CodecRedisStorage(redis=redis, state_ttl=state_ttl, data_ttl=data_ttl)
 
 
 def get_dispatcher(
@@ -46,6 +48,7 @@ def get_dispatcher(
     # Register middlewares
     dp.message.middleware(DatabaseMiddleware())
     dp.callback_query.middleware(DatabaseMiddleware())
+    dp.inline_query.middleware(DatabaseMiddleware())
     
     dp.message.middleware(TranslatorMiddleware())
     dp.callback_query.middleware(TranslatorMiddleware())
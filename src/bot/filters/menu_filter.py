@@ -0,0 +1,18 @@
+from typing import Any
+
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.filters import BaseFilter
+from aiogram.types import Message
+
+
+class MenuFilter(BaseFilter):
+    """Resolve an exact main menu text to its handler with one dict lookup."""
+
+    def __init__(self, handlers: dict[str, CallableObject]):
+        self.handlers = handlers
+
+    async def __call__(self, message: Message, *args, **kwargs) -> bool | dict[str, Any]:
+        callback = self.handlers.get(message.text)
+        if callback is None:
+            return False
+        return {'menu_callback': callback}
@@ -10,7 +10,7 @@ from src.db.database import Database
 class UserFilter(BaseFilter):
     async def __call__(self, message: Message, *args, **kwargs):
         async with AsyncSession(bind=kwargs['engine']) as session:
-            db = Database(session)
+            db = Database(session, cache=kwargs.get('cache'))
             user = await db.user.get_me(message.from_user.id)
             if user:
                 if user.is_blocked:
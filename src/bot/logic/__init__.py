@@ -2,6 +2,7 @@
 from .help import help_router
 from .start import start_router
 from .commands import commands_router
+from .menu import menu_router
 from .admin import admin_router
 
-routers = (start_router, help_router, commands_router, admin_router,)
+routers = (menu_router, start_router, help_router, commands_router, admin_router,)
@@ -1,18 +1,24 @@
-import asyncio
-
+import logging
 from datetime import datetime, timedelta
 
 from aiogram import F, types
+from aiogram.exceptions import TelegramForbiddenError
 from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, CallbackQuery
 
 from src.cache import Cache
+from src.configuration import conf
 from src.db.database import Database
+from src.db.repositories.order import day_bounds
 from src.bot.filters.admin_filter import AdminFilter
+from src.bot.middlewares.send_queue_md import Priority, send_priority
 from src.bot.structures.keyboards import common
 from src.bot.structures.fsm.admin import AdminGroup
+from src.bot.utils.messages import get_sales_report_text
 from .router import admin_router
 
+logger = logging.getLogger(__name__)
+
 
 @admin_router.message(F.text=='/admin', AdminFilter())
 async def process_admin_panel(
@@ -36,15 +42,11 @@ async def process_admin_panel(
     cache: Cache
 ):
     now = datetime.now()
-    user_count = len(await db.user.get_many())
+    user_count = await db.user.count()
 
-    orders_by_day = await db.order.get_orders_by_day(now)
-    orders_by_week = await db.order.get_orders_by_week(now - timedelta(days=datetime.now().weekday()))
-    orders_by_month = await db.order.get_orders_by_month(now.year, now.month)
-
-    orders_by_day_sum = sum([obj.total_price for obj in orders_by_day])
-    orders_by_week_sum = sum([obj.total_price for obj in orders_by_week])
-    orders_by_month_sum = sum([obj.total_price for obj in orders_by_month])
+    orders_by_day_sum = await db.order.get_total_price_by_day(now)
+    orders_by_week_sum = await db.order.get_total_price_by_week(now - timedelta(days=datetime.now().weekday()))
+    orders_by_month_sum = await db.order.get_total_price_by_month(now.year, now.month)
 
     formatted_price_by_day = "{:,}".format(orders_by_day_sum)
     formatted_price_by_week = "{:,}".format(orders_by_week_sum)
@@ -58,6 +60,28 @@ async def process_admin_panel(
 
     await message.answer(msg)
 
+
+@admin_router.message(F.text=='📊 Hisobot', AdminFilter())
+async def sales_report_handler(
+    message: Message, 
+    state: FSMContext, 
+    db: Database,
+    cache: Cache
+):
+    # Days start at local midnight, orders are stored in UTC
+    offset = timedelta(hours=conf.bot.utc_offset)
+    today = (datetime.utcnow() + offset).date()
+    start = day_bounds(today - timedelta(days=conf.bot.report_days - 1))[0] - offset
+    end = day_bounds(today)[1] - offset
+
+    products = await db.order_item.get_product_sales(start, end)
+    districts = await db.order.get_sales_by_district(start, end)
+    hours = await db.order.get_sales_by_hour(start, end, utc_offset=conf.bot.utc_offset)
+
+    await message.answer(
+        get_sales_report_text(products, districts, hours, days=conf.bot.report_days, top=conf.bot.report_top)
+    )
+
 @admin_router.message(F.text=='✍️ Habar yuborish', AdminFilter())
 async def process_admin_panel(
     message: Message, 
@@ -79,17 +103,19 @@ async def process_admin_panel(
     users = await db.user.get_many()
     count = 0
 
-    for user in users:
-        try:
-            await message.bot.send_message(
-                chat_id=user.user_id,
-                text = message.text
-            )
-            count += 1
-        except Exception as e:
-            print(e)
-        
-        await asyncio.sleep(0.5)
+    # Send queue paces broadcasts and lets live users' replies go first
+    with send_priority(Priority.BROADCAST):
+        for user in users:
+            try:
+                await message.bot.send_message(
+                    chat_id=user.user_id,
+                    text = message.text
+                )
+                count += 1
+            except TelegramForbiddenError:
+                logger.warning('Broadcast skipped user %s, the bot is blocked', user.user_id)
+            except Exception:
+                logger.exception('Broadcast to user %s failed', user.user_id)
     
     await message.answer(f"Habar {count}-ta odamga jo'natildi", reply_markup=common.get_admin_menu())
     await state.clear()
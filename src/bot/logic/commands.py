@@ -4,64 +4,194 @@ from aiogram import Router, types, F
 from aiogram.fsm.context import FSMContext
 
 from src.cache import Cache
+from src.cache.cart import CartItem
+from src.cache.namespace import LANG
+from src.configuration import conf
 from src.db.database import Database
+from src.db.models import Product
+from src.db.repositories.order import OrderLine
 from src.bot.structures.keyboards import common
 from src.bot.structures.fsm.order import OrderGroup
 from src.bot.structures.fsm.registration import RegisterGroup
-from src.bot.utils.messages import default_languages, check_phone, get_product_info
-from src.bot.utils.transliterate import transliterate
+from src.bot.utils.catalog import get_products_keyboard, product_title
+from src.bot.utils.language import get_user_language
+from src.bot.utils.messages import (
+    default_languages, check_phone, get_product_info, get_cart_text, get_order_text, get_my_orders_text
+)
+from src.bot.utils.order_notifier import OrderNotifier
+from src.bot.utils.transliterate import to_latin, transliterate
 from src.bot.filters.user_filter import UserFilter
 
 commands_router = Router(name='commands')
 commands_router.message.filter(UserFilter())
+commands_router.inline_query.filter(UserFilter())
 
 
-@commands_router.message(F.text.in_({'✅ Buyurtma berish', '✅ Буюртма бериш'}))
-async def order_handler(message: types.Message, cache: Cache, db: Database, state: FSMContext):
-    k = f'lang_{message.from_user.id}'
-    lang = await cache.get(k)
-    lang = lang.decode()
+# Registered before the state handlers, so catalog and order history pages
+# and search results work in any state
+@commands_router.callback_query(F.data.startswith('products:'))
+async def products_page_handler(c: types.CallbackQuery, cache: Cache, db: Database, state: FSMContext):
+    lang = await get_user_language(cache, db, c.from_user.id)
+
+    await c.answer()
+
+    page = max(0, int(c.data.partition(':')[2]))
+    await c.message.edit_reply_markup(reply_markup=await get_products_keyboard(cache, db, lang, page))
+    await state.set_state(OrderGroup.get_product)
 
-    products = await db.product.get_all_products()
-    products = [(obj.product_name, obj.id) for obj in products]
+
+@commands_router.inline_query()
+async def search_products_handler(query: types.InlineQuery, cache: Cache, db: Database):
+    lang = await get_user_language(cache, db, query.from_user.id)
+
+    # Names are stored in latin
+    text = to_latin(query.query.strip())
+    if text:
+        products = await db.product.search(text, limit=conf.bot.search_results)
+    else:
+        products = await db.product.get_product_items(limit=conf.bot.search_results)
+
+    results = [
+        types.InlineQueryResultArticle(
+            id=str(product.id),
+            title=product_title(product.product_name, lang),
+            input_message_content=types.InputTextMessageContent(message_text=product.product_name),
+            reply_markup=common.search_result(product.id, lang),
+        )
+        for product in products
+    ]
+    await query.answer(results, cache_time=60, is_personal=True)
+
+
+def search_result_product_id(message: types.Message) -> int | None:
+    """Product id carried by the button of a search result, names are not unique."""
+    if message.reply_markup is None:
+        return None
+    for row in message.reply_markup.inline_keyboard:
+        for button in row:
+            prefix, _, product_id = (button.callback_data or '').partition(':')
+            if prefix == 'product' and product_id.isdigit():
+                return int(product_id)
+    return None
+
+
+@commands_router.message(F.via_bot.id == F.bot.id, F.text)
+async def search_result_handler(message: types.Message, cache: Cache, db: Database, state: FSMContext):
+    lang = await get_user_language(cache, db, message.from_user.id)
+
+    product_id = search_result_product_id(message)
+    product = await db.product.get(product_id) if product_id is not None else None
+    if product is None:
+        return await message.answer(
+            default_languages[lang]['category_select'],
+            reply_markup=await get_products_keyboard(cache, db, lang)
+        )
+
+    msg = await open_product(product, lang, state)
+    await message.answer(msg, reply_markup=common.make_order_or_back(lang))
+
+
+@commands_router.callback_query(F.data.regexp(r'^product:\d+$'))
+async def search_result_button_handler(c: types.CallbackQuery, cache: Cache, db: Database, state: FSMContext):
+    lang = await get_user_language(cache, db, c.from_user.id)
+
+    await c.answer()
+
+    product = await db.product.get(int(c.data.partition(':')[2]))
+    if product is None:
+        return await c.message.answer(
+            default_languages[lang]['category_select'],
+            reply_markup=await get_products_keyboard(cache, db, lang)
+        )
+
+    msg = await open_product(product, lang, state)
+    await c.message.answer(msg, reply_markup=common.make_order_or_back(lang))
+
+
+@commands_router.callback_query(F.data.startswith('orders:'))
+async def orders_page_handler(c: types.CallbackQuery, cache: Cache, db: Database, state: FSMContext):
+    _, direction, order_id = c.data.split(':')
+    lang = await get_user_language(cache, db, c.from_user.id)
+
+    await c.answer()
+
+    text, keyboard = await get_orders_page(db, c.from_user.id, lang, **{direction: int(order_id)})
+    if text is None:
+        return await c.message.edit_text(default_languages[lang]["order_not_found"])
+    await c.message.edit_text(text, reply_markup=keyboard)
+
+
+async def my_orders_handler(message: types.Message, cache: Cache, db: Database, state: FSMContext):
+    lang = await get_user_language(cache, db, message.from_user.id)
+
+    text, keyboard = await get_orders_page(db, message.from_user.id, lang)
+    if text is None:
+        return await message.answer(default_languages[lang]["order_not_found"])
+    await message.answer(text, reply_markup=keyboard)
+
+
+async def get_orders_page(
+    db: Database, user_id: int, lang: str, before: int | None = None, after: int | None = None
+):
+    """Render a page of order history, one order more is read to know if there is a next page."""
+    size = conf.bot.orders_page_size
+    orders = await db.order.get_summaries_by_user_id(user_id, limit=size + 1, before=before, after=after)
+    if after is not None:
+        has_newer, has_older = len(orders) > size, True
+        orders = orders[-size:]
+    else:
+        has_newer, has_older = before is not None, len(orders) > size
+        orders = orders[:size]
+
+    if not orders:
+        return None, None
+    keyboard = common.orders_pages(
+        lang,
+        newer=orders[0].id if has_newer else None,
+        older=orders[-1].id if has_older else None,
+    )
+    return get_my_orders_text(orders, lang), keyboard
+
+
+async def order_handler(message: types.Message, cache: Cache, db: Database, state: FSMContext):
+    lang = await get_user_language(cache, db, message.from_user.id)
 
     await message.answer(
         default_languages[lang]['category_select'],
-        reply_markup=common.show_products(data=products, user_lang=lang)
+        reply_markup=await get_products_keyboard(cache, db, lang)
     )
 
     await state.set_state(OrderGroup.get_product)
 
 
+async def open_product(product, lang: str, state: FSMContext) -> str:
+    """Remember the chosen product and render its card."""
+    await state.set_data(
+        dict(
+            product_id=str(product.id),
+            product_price=int(product.price)
+        )
+    )
+    await state.set_state(OrderGroup.to_order)
+
+    formatted_number = "{:,}".format(int(product.price))
+    return get_product_info(lang, transliterate(product.product_name, lang), formatted_number)
+
+
 @commands_router.callback_query(OrderGroup.get_product)
 async def show_product_info(c: types.CallbackQuery, cache: Cache, db: Database, state: FSMContext):
     await c.answer()
 
     product = await db.product.get(int(c.data))
     
-    k = f'lang_{c.from_user.id}'
-    lang = await cache.get(k)
-    lang = lang.decode()
-
-    number = product.price
-    formatted_number = "{:,}".format(int(number))
-
-    await state.set_data(
-        dict(
-            product_id=c.data,
-            product_price=int(product.price)
-        )
-    )
+    lang = await get_user_language(cache, db, c.from_user.id)
 
-    msg = get_product_info(lang, transliterate(product.product_name, lang), formatted_number)
+    msg = await open_product(product, lang, state)
     await c.message.edit_text(msg, reply_markup=common.make_order_or_back(lang))
-    await state.set_state(OrderGroup.to_order)
 
 @commands_router.callback_query(OrderGroup.to_order)
 async def show_product_info(c: types.CallbackQuery, cache: Cache, db: Database, state: FSMContext):
-    k = f'lang_{c.from_user.id}'
-    lang = await cache.get(k)
-    lang = lang.decode()
+    lang = await get_user_language(cache, db, c.from_user.id)
 
     await c.answer()
 
@@ -72,12 +202,9 @@ async def show_product_info(c: types.CallbackQuery, cache: Cache, db: Database,
         )
         await state.set_state(OrderGroup.get_count)
     else:
-        products = await db.product.get_all_products()
-        products = [(obj.product_name, obj.id) for obj in products]
-
         await c.message.edit_text(
             default_languages[lang]['category_select'],
-            reply_markup=common.show_products(data=products, user_lang=lang)
+            reply_markup=await get_products_keyboard(cache, db, lang)
         )
 
         await state.set_state(OrderGroup.get_product)
@@ -95,14 +222,12 @@ async def get_count_handler(message: types.Message, cache: Cache, db: Database,
     # else:
     #     product_min_count = 2
 
-    k = f'lang_{message.from_user.id}'
-    lang = await cache.get(k)
-    lang = lang.decode()
+    lang = await get_user_language(cache, db, message.from_user.id)
 
     if match:
         count = int(match.group())
         # if count >= product_min_count:
-        await db.cart.new(
+        await cache.cart.add(
             user_id=message.from_user.id,
             product_id=product_id,
             total_price=product_price * count,
@@ -118,40 +243,11 @@ async def get_count_handler(message: types.Message, cache: Cache, db: Database,
     else:
         await message.answer(default_languages[lang]['invalid_quantity'])
 
-@commands_router.message(F.text.in_({'📦 Mening buyurtmalarim', '📦 Менинг буюртмаларим'}))
-async def my_orders_handler(message: types.Message, cache: Cache, db: Database, state: FSMContext):
-    orders = await db.order.get_all_by_user_id(message.from_user.id)
-    k = f'lang_{message.from_user.id}'
-    lang = await cache.get(k)
-    lang = lang.decode()
-
-    lat_longs = []
-
-    if orders:
-        msg = default_languages[lang]["order"] + '\n\n'
-        for order in orders:
-            msg += f"Buyurtma #{order.id}\n"
-            msg += "Holati: TO'LANGAN\n"
-            msg += "Manzil: {}\n"
-            formatted_price = "{:,}".format(int(order.total_price)) 
-            msg += f"Jami narx: {formatted_price}\n"
-            msg += f"Buyurtma berilgan sana: {order.created_at}\n\n"
-            lat_longs.append(f"https://www.google.com/maps?q={order.lat_long}")
-        
-        result = transliterate(msg, lang)
-        await message.answer(result.format(*lat_longs))
-    else:
-        await message.answer(default_languages[lang]["order_not_found"])
-    
-@commands_router.message(F.text.in_({'📲 Biz bilan bog‘lanish', '📲 Биз билан боғланиш'}))
 async def contact_handler(message: types.Message, state: FSMContext):
     await message.answer("📞 +998916694474\n📩 @Ruqiyasuv")
 
-@commands_router.message(F.text.in_({'⚙️ Sozlamalar', '⚙️ Созламалар'}))
-async def settings_handler(message: types.Message, cache: Cache, state: FSMContext):
-    k = f'lang_{message.from_user.id}'
-    lang = await cache.get(k)
-    lang = lang.decode()
+async def settings_handler(message: types.Message, cache: Cache, db: Database, state: FSMContext):
+    lang = await get_user_language(cache, db, message.from_user.id)
 
     await message.answer(
         transliterate("Kerakli sozlamalarni tanlang:", lang), 
@@ -162,9 +258,7 @@ async def settings_handler(message: types.Message, cache: Cache, state: FSMConte
 
 @commands_router.callback_query(RegisterGroup.choose_option)
 async def choose_option_handler(c: types.CallbackQuery, cache: Cache, db: Database, state: FSMContext):
-    k = f'lang_{c.from_user.id}'
-    lang = await cache.get(k)
-    lang = lang.decode()
+    lang = await get_user_language(cache, db, c.from_user.id)
 
     await c.answer()
 
@@ -185,17 +279,13 @@ async def choose_option_handler(c: types.CallbackQuery, cache: Cache, db: Databa
 
 @commands_router.callback_query(RegisterGroup.change_lang)
 async def change_lang_handler(c: types.CallbackQuery, cache: Cache, db: Database, state: FSMContext):
-    k = f'lang_{c.from_user.id}'
-    # lang = await cache.get(k)
-    # lang = lang.decode()
-
     await c.answer()
 
     match c.data:
         case 'lang_uz': lang = 'LATIN'
         case 'lang_ru': lang = 'CYRILLIC'
 
-    await cache.set(k, lang)
+    await cache.set(LANG.key(c.from_user.id), lang)
     await db.user.update_user(
         user_id=c.from_user.id,
         language_code=lang
@@ -206,9 +296,7 @@ async def change_lang_handler(c: types.CallbackQuery, cache: Cache, db: Database
 
 @commands_router.message(F.contact | F.text, RegisterGroup.change_phone_number)
 async def change_contact_handler(message: types.Message, cache: Cache, db: Database, state: FSMContext):
-    k = f'lang_{message.from_user.id}'
-    lang = await cache.get(k)
-    lang = lang.decode()
+    lang = await get_user_language(cache, db, message.from_user.id)
 
     if message.contact:
         await message.answer(transliterate("Muvafaqiyatli o'zgardi", lang))
@@ -228,9 +316,7 @@ async def change_contact_handler(message: types.Message, cache: Cache, db: Datab
 
 @commands_router.message(RegisterGroup.change_fullname)
 async def change_fullname_handler(message: types.Message, cache: Cache, db: Database, state: FSMContext):
-    k = f'lang_{message.from_user.id}'
-    lang = await cache.get(k)
-    lang = lang.decode()
+    lang = await get_user_language(cache, db, message.from_user.id)
 
     await db.user.update_user(
         user_id=message.from_user.id,
@@ -239,24 +325,32 @@ async def change_fullname_handler(message: types.Message, cache: Cache, db: Data
     await message.answer(default_languages[lang]["full_name_update"])
     await state.clear()
 
-@commands_router.message(F.text.in_({'🛒 Savatcha', '🛒 Cаватча'}))
+async def get_cart_products(cache: Cache, db: Database, user_id: int) -> list[tuple[CartItem, Product]]:
+    """Cart lines with their products, lines of deleted products are dropped from the cart."""
+    cart_products = []
+    deleted = []
+    for cart_product in await cache.cart.get_items(user_id=user_id):
+        product = await db.product.get(cart_product.product_id)
+        if product is None:
+            deleted.append(cart_product.product_id)
+        else:
+            cart_products.append((cart_product, product))
+    await cache.cart.remove(user_id, *deleted)
+    return cart_products
+
+
 async def cart_handler(message: types.Message, cache: Cache, db: Database, state: FSMContext):
-    cart_products = await db.cart.get_cart_products(user_id=message.from_user.id)
+    cart_products = await get_cart_products(cache, db, message.from_user.id)
 
-    k = f'lang_{message.from_user.id}'
-    lang = await cache.get(k)
-    lang = lang.decode()
+    lang = await get_user_language(cache, db, message.from_user.id)
 
     if cart_products:
-        result = "Sizning savatchangiz:\n"
-        for cart_product in cart_products:
-            product = await db.product.get(cart_product.product_id)
-            result += f"Tovar nomi: {product.product_name}\n"
-            result += f"Tovar soni: {cart_product.total_count}\n"
-            formatted_cart_price = "{:,}".format(int(cart_product.total_price)) 
-            result += f"Umumiy summa: {formatted_cart_price}\n\n"
-        
-        await message.answer(transliterate(result, lang), reply_markup=common.make_order(lang))
+        lines = [
+            (product.product_name, cart_product.total_count, int(cart_product.total_price))
+            for cart_product, product in cart_products
+        ]
+
+        await message.answer(get_cart_text(lines, lang), reply_markup=common.make_order(lang))
         await state.set_state(OrderGroup.show_regions)
     else:
         await message.answer(default_languages[lang]['product_not_cart'])
@@ -264,15 +358,13 @@ async def cart_handler(message: types.Message, cache: Cache, db: Database, state
 
 @commands_router.callback_query(OrderGroup.show_regions)
 async def show_districts(c: types.CallbackQuery, cache: Cache, db: Database, state: FSMContext):
-    k = f'lang_{c.from_user.id}'
-    lang = await cache.get(k)
-    min_sum = await cache.get("min_sum")
-    lang = lang.decode()
+    lang, min_sum = await cache.get_many(LANG.key(c.from_user.id), "min_sum")
+    lang = lang.decode() if lang else await get_user_language(cache, db, c.from_user.id)
     min_sum = int(min_sum.decode())
     formatted_min_sum = "{:,}".format(min_sum) 
 
-    user_products = await db.cart.get_cart_products(c.from_user.id)
-    user_products_sum = sum([int(obj.total_price) for obj in user_products])
+    user_products = await get_cart_products(cache, db, c.from_user.id)
+    user_products_sum = sum([int(obj.total_price) for obj, _ in user_products])
 
     if c.data == 'make_order':
         if min_sum > user_products_sum:
@@ -299,9 +391,7 @@ async def show_districts(c: types.CallbackQuery, cache: Cache, db: Database, sta
 
 @commands_router.callback_query(OrderGroup.show_districts)
 async def show_districts(c: types.CallbackQuery, cache: Cache, db: Database, state: FSMContext):
-    k = f'lang_{c.from_user.id}'
-    lang = await cache.get(k)
-    lang = lang.decode()
+    lang = await get_user_language(cache, db, c.from_user.id)
 
     await c.answer()
 
@@ -311,13 +401,18 @@ async def show_districts(c: types.CallbackQuery, cache: Cache, db: Database, sta
     await state.set_state(OrderGroup.get_geo)
 
 @commands_router.message(OrderGroup.get_geo, F.location)
-async def cart_handler(message: types.Message, cache: Cache, db: Database, state: FSMContext):
-    cart_products = await db.cart.get_cart_products(user_id=message.from_user.id)
+async def checkout_handler(
+    message: types.Message, cache: Cache, db: Database, order_notifier: OrderNotifier, state: FSMContext
+):
+    cart_products = await get_cart_products(cache, db, message.from_user.id)
     user = await db.user.get_me(user_id=message.from_user.id)
 
-    k = f'lang_{message.from_user.id}'
-    lang = await cache.get(k)
-    lang = lang.decode()
+    lang = await get_user_language(cache, db, message.from_user.id)
+
+    if not cart_products:
+        # Every product of the cart was deleted meanwhile
+        await message.answer(default_languages[lang]['product_not_cart'], reply_markup=common.get_main_menu(lang))
+        return await state.clear()
 
     lat = message.location.latitude
     lon = message.location.longitude
@@ -326,47 +421,43 @@ async def cart_handler(message: types.Message, cache: Cache, db: Database, state
     region = data.get("region")
     district = data.get("district")
 
-    total_price = 0
-
-    result = "Yangi buyurtma!\n"
-    result += "Holati: 🟡 Kutilmoqda\n\n"
-    result += f"Foydalanuvchi: {user.full_name}\n"
-    result += f"Telefon raqam: {user.phone_number}\n"
-    result += f"Manzil: https://www.google.com/maps?q={lat},{lon}\n"
-    result += f"Viloyat: {region}\n"
-    result += f"Shahar: {district}\n\n"
-
-    for cart_product in cart_products:
-        result += f"Buyurtma:\n"
-        product = await db.product.get(cart_product.product_id)
-        result += f"Nomi: {product.product_name}\n"
-        result += f"Miqdori: {cart_product.total_count}\n"
-        formatted_cart_price = "{:,}".format(int(cart_product.total_price)) 
-        result += f"Umumiy summa: {formatted_cart_price}\n\n"
-        total_price += cart_product.total_price
-
-        await db.cart.delete_cart(cart_id=cart_product.id)
-
-    formatted_price = "{:,}".format(total_price) 
-    result += f"Jami narx: {formatted_price}"
+    lines = []
+    items = []
+    for cart_product, product in cart_products:
+        lines.append((product.product_name, cart_product.total_count, int(cart_product.total_price)))
+        # The price the product was put in the cart for, not its current one
+        unit_price = cart_product.total_price // cart_product.total_count if cart_product.total_count else 0
+        items.append(OrderLine(cart_product.product_id, cart_product.total_count, unit_price))
+    total_price = sum(price for _, _, price in lines)
+
+    result = get_order_text(
+        user.full_name, user.phone_number, f"{lat},{lon}", region, district, lines
+    )
 
-    await db.order.new(
+    order_id = await db.order.new(
         user_id=user.user_id,
         total_price=total_price,
-        lat_long=f"{lat},{lon}"
+        lat_long=f"{lat},{lon}",
+        region=region,
+        district=district,
+        items=items,
     )
+    await cache.cart.clear(user_id=message.from_user.id)
 
-    await message.bot.send_message(
-        chat_id=-1002256139682,
-        text=result,
-        reply_markup=common.get_order()
-    )
+    await order_notifier.publish(result, order_id=order_id)
     await message.answer(default_languages[lang]['order__'], reply_markup=common.get_main_menu(lang))
     await state.clear()
 
 
-@commands_router.callback_query(F.data=='get_order')
-async def show_districts(c: types.CallbackQuery, cache: Cache, db: Database, state: FSMContext):
+@commands_router.callback_query(F.data.startswith('get_order'))
+async def get_order_handler(c: types.CallbackQuery, cache: Cache, db: Database, state: FSMContext):
+    _, _, order_id = c.data.partition(':')
+    # Messages sent before orders had ids can't be claimed, keep their old behaviour
+    if order_id and not await db.order.claim(int(order_id), courier_id=c.from_user.id):
+        return await c.answer("Bu buyurtma allaqachon olingan", show_alert=True)
+
+    await c.answer()
+
     msg_text = c.message.text
     new_status = "Holati: 🟢 Qabul qilindi\n\n" \
                  f"Kuryer haqida ma'lumot:\n" \
@@ -0,0 +1,41 @@
+"""This file represents a fast path for the main menu buttons.
+
+Reply keyboard texts are resolved to their handlers with a single dict lookup
+before the user check runs, so any other text falls through to the regular
+routers untouched. Only users in no state are served here, texts sent while a
+state waits for input (a count, a name) go to the state's handler.
+"""
+from aiogram import Router, types
+from aiogram.dispatcher.event.handler import CallableObject
+from aiogram.filters import StateFilter
+
+from src.bot.filters.menu_filter import MenuFilter
+from src.bot.filters.user_filter import UserFilter
+from src.bot.utils.messages import all_languages, default_languages
+
+from .commands import (
+    cart_handler, contact_handler, my_orders_handler, order_handler, settings_handler
+)
+
+MENU_HANDLERS = {
+    'categories': order_handler,
+    'my_orders': my_orders_handler,
+    'contact_us': contact_handler,
+    'settings': settings_handler,
+    'cart': cart_handler,
+}
+
+menu_index = {
+    default_languages[lang][key]: CallableObject(handler)
+    for key, handler in MENU_HANDLERS.items()
+    for lang in all_languages
+}
+
+menu_router = Router(name='menu')
+menu_router.message.filter(MenuFilter(menu_index), StateFilter(None), UserFilter())
+
+
+@menu_router.message()
+async def menu_handler(message: types.Message, menu_callback: CallableObject, **data):
+    """Call the handler resolved by MenuFilter."""
+    return await menu_callback.call(message, **data)
@@ -5,6 +5,7 @@ from aiogram.fsm.context import FSMContext
 from aiogram.filters import CommandStart
 
 from src.cache import Cache
+from src.cache.namespace import LANG
 from src.db.database import Database
 from src.bot.structures.keyboards import common
 from src.bot.structures.fsm.registration import RegisterGroup
@@ -91,8 +92,7 @@ async def get_phone_number(message: types.Message, db: Database, cache: Cache, s
         reply_markup=common.get_main_menu(user_lang=lang)
     )
 
-    k = f'lang_{message.from_user.id}'
-    await cache.set(k, lang)
+    await cache.set(LANG.key(message.from_user.id), lang)
     
     await state.clear()
 
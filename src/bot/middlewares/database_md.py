@@ -3,7 +3,7 @@ from collections.abc import Awaitable, Callable
 from typing import Any
 
 from aiogram import BaseMiddleware
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import CallbackQuery, InlineQuery, Message
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.structures.data_structure import TransferData
@@ -16,10 +16,10 @@ class DatabaseMiddleware(BaseMiddleware):
     async def __call__(
         self,
         handler: Callable[[Message, dict[str, Any]], Awaitable[Any]],
-        event: Message | CallbackQuery,
+        event: Message | CallbackQuery | InlineQuery,
         data: TransferData,
     ) -> Any:
         """This method calls every update."""
         async with AsyncSession(bind=data['engine']) as session:
-            data['db'] = Database(session)
+            data['db'] = Database(session, cache=data.get('cache'))
             return await handler(event, data)
@@ -0,0 +1,292 @@
+"""Send queue middleware puts outbound Telegram requests under one rate control.
+
+Requests addressed to a chat are queued by priority (interactive replies first,
+group notifications next, broadcasts last) and released by worker tasks that
+respect the global and per-chat limits of the Bot API. Every chat keeps its own
+FIFO and only the head of it takes part in the priority queue, so messages of a
+chat are always sent in order. A head whose chat has to wait is put back into
+the queue when its turn comes, so workers never sleep on one slow chat. Flood
+control errors are retried automatically after the delay Telegram asks for,
+holding back everything queued behind them for that chat.
+"""
+import asyncio
+import enum
+import itertools
+import logging
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware, NextRequestMiddlewareType
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from src.configuration import conf
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(enum.IntEnum):
+    """Send priorities, lower value is sent first."""
+
+    INTERACTIVE = 0
+    GROUP = 1
+    BROADCAST = 2
+
+
+send_priority_var: ContextVar[Priority | None] = ContextVar('send_priority', default=None)
+
+
+@contextmanager
+def send_priority(priority: Priority) -> Iterator[None]:
+    """Send every request made inside this block with the given priority.
+
+    Example:
+    >> with send_priority(Priority.BROADCAST):
+    >>     await bot.send_message(chat_id=user_id, text=text)
+    """
+    token = send_priority_var.set(priority)
+    try:
+        yield
+    finally:
+        send_priority_var.reset(token)
+
+
+class TokenBucket:
+    """Token bucket which hands out reservations instead of blocking."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """Take one token and return how long to wait before using it."""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def penalize(self, delay: float) -> None:
+        """Push the bucket into debt so nothing is released for `delay` seconds."""
+        self._refill(time.monotonic())
+        self.tokens = min(self.tokens, 0.0) - delay * self.rate
+
+    @property
+    def idle(self) -> bool:
+        """Bucket is full, so dropping it loses nothing."""
+        self._refill(time.monotonic())
+        return self.tokens >= self.capacity
+
+
+@dataclass(order=True)
+class QueuedRequest:
+    """Request waiting in the send queue, ordered by priority and then arrival."""
+
+    priority: Priority
+    number: int
+    chat_id: int | str = field(compare=False)
+    make_request: NextRequestMiddlewareType = field(compare=False)
+    bot: Bot = field(compare=False)
+    method: TelegramMethod = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    attempt: int = field(default=0, compare=False)
+    reserved: bool = field(default=False, compare=False)
+    """ The chat's token is taken already, the request only waited for it """
+
+
+class SendQueueMiddleware(BaseRequestMiddleware):
+    """This middleware queues every request sent to a chat."""
+
+    MAX_CHAT_BUCKETS = 10_000
+
+    def __init__(
+        self,
+        global_rate: float = conf.send_queue.global_rate,
+        chat_rate: float = conf.send_queue.chat_rate,
+        group_rate: float = conf.send_queue.group_rate,
+        burst: int = conf.send_queue.burst,
+        workers: int = conf.send_queue.workers,
+        max_retries: int = conf.send_queue.max_retries,
+    ):
+        """Initialize send queue.
+
+        :param global_rate: Requests per second for the whole bot
+        :param chat_rate: Requests per second for one private chat
+        :param group_rate: Requests per second for one group chat
+        :param burst: How many requests one chat may send without waiting
+        :param workers: Count of concurrent senders
+        :param max_retries: How many times a flood controlled request is retried.
+        """
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.burst = burst
+        self.workers = workers
+        self.max_retries = max_retries
+
+        self.global_bucket = TokenBucket(rate=global_rate, capacity=global_rate)
+        self.chat_buckets: dict[int | str, TokenBucket] = {}
+
+        self.queue: asyncio.PriorityQueue | None = None
+        self.chats: dict[int | str, deque[QueuedRequest]] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._counter = itertools.count()
+        self._delayed: set[asyncio.TimerHandle] = set()
+        self._pending: set[asyncio.Future] = set()
+
+    @staticmethod
+    def is_group(chat_id: int | str) -> bool:
+        """Groups and channels have negative ids or public @usernames."""
+        return isinstance(chat_id, str) or chat_id < 0
+
+    def priority(self, chat_id: int | str) -> Priority:
+        """Priority of a request to the given chat."""
+        priority = send_priority_var.get()
+        if priority is not None:
+            return priority
+        return Priority.GROUP if self.is_group(chat_id) else Priority.INTERACTIVE
+
+    def chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        """Get or create the bucket of a chat."""
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self.chat_buckets) >= self.MAX_CHAT_BUCKETS:
+                self.chat_buckets = {
+                    key: value for key, value in self.chat_buckets.items() if not value.idle
+                }
+            rate = self.group_rate if self.is_group(chat_id) else self.chat_rate
+            bucket = self.chat_buckets[chat_id] = TokenBucket(rate=rate, capacity=self.burst)
+        return bucket
+
+    def start(self) -> None:
+        """Start workers in the running event loop."""
+        self.queue = asyncio.PriorityQueue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self, timeout: float = conf.send_queue.drain_timeout) -> None:
+        """Send what is still queued and stop workers.
+
+        :param timeout: Seconds to wait for queued requests, the rest are cancelled
+        """
+        if self._pending:
+            await asyncio.wait(self._pending, timeout=timeout)
+        for handle in self._delayed:
+            handle.cancel()
+        self._delayed.clear()
+        for future in list(self._pending):
+            future.cancel()
+        self.chats.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Any:
+        """This method calls every outbound request."""
+        chat_id = getattr(method, 'chat_id', None)
+        if chat_id is None:
+            # getUpdates, answerCallbackQuery and others are not chat bound
+            return await make_request(bot, method)
+
+        if not self._tasks:
+            self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        request = QueuedRequest(
+            self.priority(chat_id), next(self._counter), chat_id, make_request, bot, method, future
+        )
+        chat = self.chats.setdefault(chat_id, deque())
+        chat.append(request)
+        if len(chat) == 1:
+            # The chat was idle, its head joins the queue right away
+            self.queue.put_nowait(request)
+        return await future
+
+    def _advance(self, request: QueuedRequest) -> None:
+        """Drop the head of the chat and let the next request of it join the queue."""
+        chat = self.chats.get(request.chat_id)
+        if not chat or chat[0] is not request:
+            return
+        chat.popleft()
+        if chat:
+            self.queue.put_nowait(chat[0])
+        else:
+            del self.chats[request.chat_id]
+
+    def _put_later(self, delay: float, request: QueuedRequest) -> None:
+        """Put the request back into the queue after the delay."""
+        def put() -> None:
+            self._delayed.discard(handle)
+            self.queue.put_nowait(request)
+
+        handle = asyncio.get_running_loop().call_later(delay, put)
+        self._delayed.add(handle)
+
+    async def _worker(self) -> None:
+        while True:
+            request = await self.queue.get()
+            try:
+                if request.future.done():
+                    self._advance(request)
+                    continue
+                if not request.reserved:
+                    delay = self.chat_bucket(request.chat_id).reserve()
+                    if delay > 0:
+                        # Its turn is taken, the next ready request goes meanwhile
+                        request.reserved = True
+                        self._put_later(delay, request)
+                        continue
+                await asyncio.sleep(self.global_bucket.reserve())
+                await self._send(request)
+            finally:
+                self.queue.task_done()
+
+    async def _send(self, request: QueuedRequest) -> None:
+        try:
+            response = await request.make_request(request.bot, request.method)
+        except TelegramRetryAfter as e:
+            if request.attempt >= self.max_retries:
+                self._resolve(request, exception=e)
+                return
+            request.attempt += 1
+            logger.warning(
+                'Flood control in chat %s, retry %s in %s seconds',
+                request.chat_id, request.attempt, e.retry_after
+            )
+            self.chat_bucket(request.chat_id).penalize(e.retry_after)
+            # Still the head of its chat, so nothing queued behind it goes first
+            request.reserved = False
+            self._put_later(e.retry_after, request)
+        except Exception as e:
+            self._resolve(request, exception=e)
+        else:
+            self._resolve(request, result=response)
+
+    def _resolve(self, request: QueuedRequest, result: Any = None, exception: Exception | None = None) -> None:
+        self._advance(request)
+        if request.future.done():
+            return
+        if exception is not None:
+            request.future.set_exception(exception)
+        else:
+            request.future.set_result(result)
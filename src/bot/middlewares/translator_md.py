@@ -5,8 +5,9 @@ from aiogram.types import CallbackQuery, Message
 
 from src.bot.structures.data_structure import TransferData
 from src.cache import Cache
+from src.cache.namespace import LANG
 from src.configuration import conf
-from src.language.translator import LocaleScheme, Translator
+from src.language.translator import LOCALE_BY_LANGUAGE, Translator
 from src.language.enums import LocaleIdentificationMode
 
 
@@ -26,20 +27,16 @@ class TranslatorMiddleware(BaseMiddleware):
         ):
             """Get locale from user language code"""
             data["translator"] = translator(language=event.from_user.language_code)
-            return await handler(event, data)
         elif (
             conf.translate.locale_identify_mode == LocaleIdentificationMode.BY_DATABASE
         ):
-            """Get locale from cache"""
+            """Get locale from the user's language key, it is kept in process
+            memory, so this usually does not reach Redis"""
             cache: Cache = data["cache"]
-            locale_key = LocaleScheme(user_id=event.from_user.id)
-            # Use default locale
-            locale = conf.translate.default_locale
-            if await cache.exists(locale_key):
-                # If any locale key were set then use it
-                locale = await cache.get(locale_key)
+            language = await cache.get(LANG.key(event.from_user.id))
+            # Unknown users and expired keys get the default locale
             data["translator"] = translator(
-                language=locale.decode() if isinstance(locale, bytes) else locale
+                language=LOCALE_BY_LANGUAGE.get(language.decode()) if language else None
             )
 
-            return await handler(event, data)
\ No newline at end of file
+        return await handler(event, data)
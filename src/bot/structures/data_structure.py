@@ -10,6 +10,7 @@ from aiogram import Bot
 from sqlalchemy.ext.asyncio import AsyncEngine
 
 from src.bot.structures.role import Role
+from src.bot.utils.order_notifier import OrderNotifier
 from src.db.database import Database
 
 from src.language.translator import Translator, LocalizedTranslator
@@ -23,6 +24,7 @@ class TransferData(TypedDict):
     db: Database
     bot: Bot
     role: Role
+    order_notifier: OrderNotifier
 
 
 class TransferUserData(TypedDict):
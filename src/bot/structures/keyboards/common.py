@@ -38,6 +38,7 @@ def get_admin_menu(user_lang: str = 'LATIN'):
     admin_menu_keyboard = ReplyKeyboardMarkup(keyboard=[
         [
             KeyboardButton(text="👤 Statistika"),
+            KeyboardButton(text="📊 Hisobot"),
             KeyboardButton(text="✍️ Habar yuborish")
         ],
         [
@@ -78,12 +79,41 @@ def get_location(user_lang: str = None):
     ], resize_keyboard=True )
     return main_menu_keyboard
 
-def show_products(data: List[Tuple], user_lang: str):
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+def show_products(data: List[Tuple], user_lang: str, page: int = 0, has_next: bool = False):
+    rows = [
         [
             InlineKeyboardButton(text=transliterate(data[i][0], user_lang), callback_data=str(data[i][1])) 
         ]
         for i in range(len(data))
+    ]
+
+    pages = []
+    if page > 0:
+        pages.append(InlineKeyboardButton(
+            text=default_languages[user_lang]["previous_page"], callback_data=f"products:{page - 1}"
+        ))
+    if has_next:
+        pages.append(InlineKeyboardButton(
+            text=default_languages[user_lang]["next_page"], callback_data=f"products:{page + 1}"
+        ))
+    if pages:
+        rows.append(pages)
+    rows.append([
+        InlineKeyboardButton(text=default_languages[user_lang]["search"], switch_inline_query_current_chat="")
+    ])
+
+    keyboard = InlineKeyboardMarkup(inline_keyboard=rows)
+    return keyboard
+
+
+def search_result(product_id: int, user_lang: str):
+    # Messages sent through inline search carry the product id in this button
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(
+                text=default_languages[user_lang]["place_order"], callback_data=f"product:{product_id}"
+            )
+        ],
     ])
     return keyboard
 
@@ -138,10 +168,11 @@ def show_settings(user_lang: str):
     return keyboard
 
 
-def get_order():
+def get_order(order_id: int | None = None):
+    callback_data = "get_order" if order_id is None else f"get_order:{order_id}"
     keyboard = InlineKeyboardMarkup(inline_keyboard=[
         [
-            InlineKeyboardButton(text="Buyurtmani olish", callback_data="get_order"),
+            InlineKeyboardButton(text="Buyurtmani olish", callback_data=callback_data),
         ]
     ])
 
@@ -156,3 +187,20 @@ def make_order(user_lang: str):
     ])
 
     return keyboard
+
+
+def orders_pages(user_lang: str, newer: int | None = None, older: int | None = None):
+    buttons = []
+    if newer is not None:
+        buttons.append(InlineKeyboardButton(
+            text=default_languages[user_lang]["newer_orders"], callback_data=f"orders:after:{newer}"
+        ))
+    if older is not None:
+        buttons.append(InlineKeyboardButton(
+            text=default_languages[user_lang]["older_orders"], callback_data=f"orders:before:{older}"
+        ))
+    if not buttons:
+        return None
+
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[buttons])
+    return keyboard
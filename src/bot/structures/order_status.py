@@ -0,0 +1,10 @@
+"""Order statuses."""
+
+import enum
+
+
+class OrderStatus(str, enum.Enum):
+    """Order lifecycle in the couriers group."""
+
+    PENDING = 'pending'
+    ACCEPTED = 'accepted'
@@ -0,0 +1,42 @@
+"""This file contains the product keyboard pages, cached per language."""
+import functools
+
+from aiogram.types import InlineKeyboardMarkup
+
+from src.bot.structures.keyboards import common
+from src.bot.utils.transliterate import transliterate
+from src.cache import Cache
+from src.cache.namespace import CATALOG
+from src.configuration import conf
+from src.db.database import Database
+
+
+async def get_products_keyboard(cache: Cache, db: Database, lang: str, page: int = 0) -> InlineKeyboardMarkup:
+    """Get a page of the product keyboard.
+
+    Rendered pages are cached, so the names are transliterated once per
+    language. ProductRepo drops the pages when products change.
+
+    :param cache: Cache adapter
+    :param db: Database
+    :param lang: 'LATIN' or 'CYRILLIC'
+    :param page: Page number from 0
+    :return: Keyboard.
+    """
+    key = CATALOG.key(lang, page)
+    data = await cache.get(key)
+    if data is not None:
+        return InlineKeyboardMarkup.model_validate_json(data)
+
+    size = conf.bot.products_page_size
+    # One product more is read to know if there is a next page
+    products = await db.product.get_product_items(offset=page * size, limit=size + 1)
+    keyboard = common.show_products(products[:size], lang, page=page, has_next=len(products) > size)
+    await cache.set(key, keyboard.model_dump_json(exclude_none=True))
+    return keyboard
+
+
+@functools.lru_cache(maxsize=4096)
+def product_title(product_name: str, lang: str) -> str:
+    """Product name in the user's alphabet, names are few and transliteration is slow."""
+    return transliterate(product_name, lang)
@@ -0,0 +1,92 @@
+"""This file contains the start-up import profile of the bot.
+
+Usage:
+    python -m src.bot.utils.importtime [--module src.bot.__main__] [--runs 5] [--top 20]
+
+The module is imported in fresh interpreters with ``-X importtime``. Self times
+are summed per package and the slowest modules are listed, medians of all runs
+are reported. The first run also warms up bytecode caches, so it is skipped.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+PREFIX = 'import time:'
+
+
+def parse(output: str) -> dict[str, tuple[int, int]]:
+    """Parse ``-X importtime`` output.
+
+    :param output: Interpreter stderr
+    :return: Self and cumulative microseconds by module name.
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith(PREFIX) or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len(PREFIX):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def package_of(name: str) -> str:
+    """Package which a module is accounted to, project modules are split by subpackage."""
+    parts = name.split('.')
+    return '.'.join(parts[:2]) if parts[0] == 'src' else parts[0]
+
+
+def profile(module: str, runs: int) -> list[dict[str, tuple[int, int]]]:
+    """Import the module in fresh interpreters.
+
+    :param module: Module to import
+    :param runs: Count of measured runs
+    :return: Parsed output of every run.
+    """
+    results = []
+    for _ in range(runs + 1):
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            capture_output=True, text=True, env=os.environ,
+        )
+        if process.returncode:
+            sys.exit(process.stderr)
+        results.append(parse(process.stderr))
+    return results[1:]
+
+
+def report(results: list[dict[str, tuple[int, int]]], module: str, top: int) -> str:
+    """Render medians of all runs as tables."""
+    self_times: dict[str, list[int]] = defaultdict(list)
+    package_times: dict[str, list[int]] = defaultdict(list)
+    for modules in results:
+        packages: dict[str, int] = defaultdict(int)
+        for name, (self_us, _) in modules.items():
+            self_times[name].append(self_us)
+            packages[package_of(name)] += self_us
+        for name, total in packages.items():
+            package_times[name].append(total)
+
+    total = statistics.median(modules[module][1] for modules in results)
+    lines = [f'{module}: {total / 1000:.1f} ms', '', f"{'package':<40}{'self, ms':>10}{'share':>8}"]
+    packages = sorted(package_times.items(), key=lambda item: -statistics.median(item[1]))
+    for name, times in packages[:top]:
+        value = statistics.median(times)
+        lines.append(f'{name:<40}{value / 1000:>10.1f}{value / total:>8.0%}')
+
+    lines += ['', f"{'module':<60}{'self, ms':>10}"]
+    slowest = sorted(self_times.items(), key=lambda item: -statistics.median(item[1]))
+    for name, times in slowest[:top]:
+        lines.append(f'{name:<60}{statistics.median(times) / 1000:>10.1f}')
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Profile imports done at bot start-up')
+    parser.add_argument('--module', default='src.bot.__main__', help='module to import')
+    parser.add_argument('--runs', type=int, default=5, help='measured runs')
+    parser.add_argument('--top', type=int, default=20, help='rows per table')
+    args = parser.parse_args()
+    print(report(profile(args.module, args.runs), args.module, args.top))
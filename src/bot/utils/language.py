@@ -0,0 +1,25 @@
+"""This file contains the lookup of a user's language."""
+from src.cache import Cache
+from src.cache.namespace import LANG
+from src.configuration import conf
+from src.db.database import Database
+
+
+async def get_user_language(cache: Cache, db: Database, user_id: int) -> str:
+    """Get user's language, 'LATIN' or 'CYRILLIC'.
+
+    Language keys expire, an expired one is restored from the database.
+
+    :param cache: Cache adapter
+    :param db: Database
+    :param user_id: Telegram user id
+    :return: Language name.
+    """
+    lang = await cache.get(LANG.key(user_id))
+    if lang is not None:
+        return lang.decode()
+
+    user = await db.user.get_me(user_id)
+    locale = user.language_code if user and user.language_code else conf.default_locale
+    await cache.set(LANG.key(user_id), locale.name)
+    return locale.name
@@ -1,4 +1,7 @@
 import re
+from typing import Iterable, Sequence, Tuple
+
+from src.bot.utils.transliterate import transliterate
 
 all_languages = ['LATIN', 'CYRILLIC']
 
@@ -50,6 +53,11 @@ default_languages = {
         "products": "Mahsulotlar",
         "category_select": "Mahsulotlarni tanlang",
         "order_not_found": "Buyurtma topilmadi!",
+        "newer_orders": "⬅️ Yangiroq",
+        "older_orders": "Eskiroq ➡️",
+        "previous_page": "⬅️ Oldingi",
+        "next_page": "Keyingi ➡️",
+        "search": "🔍 Qidirish",
         "successful_changed": "Muvaffaqiyatli o'zgartirildi",
         "select_language": "Til tanlang!",
         'categories': '✅ Buyurtma berish',
@@ -104,6 +112,11 @@ default_languages = {
         "products": "Маҳсулотлар",
         "category_select": "Маҳсулотларни танланг",
         "order_not_found": "Буюртма топилмади!",
+        "newer_orders": "⬅️ Янгироқ",
+        "older_orders": "Эскироқ ➡️",
+        "previous_page": "⬅️ Олдинги",
+        "next_page": "Кейинги ➡️",
+        "search": "🔍 Қидириш",
         "successful_changed": "Муваффақиятли ўзгартирилди",
         "select_language": "Тил танланг!",
         'categories': '✅ Буюртма бериш',
@@ -188,4 +201,97 @@ def translate_region(name: str, user_lang: str):
     if user_lang == 'CYRILLIC':
         return d[name]
     else:
-        return name
\ No newline at end of file
+        return name
+
+def format_price(price) -> str:
+    return "{:,}".format(int(price))
+
+
+def get_cart_text(lines: Iterable[Tuple[str, int, int]], user_lang: str) -> str:
+    result = "Sizning savatchangiz:\n"
+    for product_name, count, price in lines:
+        result += f"Tovar nomi: {product_name}\n"
+        result += f"Tovar soni: {count}\n"
+        result += f"Umumiy summa: {format_price(price)}\n\n"
+    return transliterate(result, user_lang)
+
+
+def get_order_text(
+    full_name: str, phone_number: str, lat_long: str, region: str, district: str,
+    lines: Iterable[Tuple[str, int, int]]
+) -> str:
+    result = "Yangi buyurtma!\n"
+    result += "Holati: 🟡 Kutilmoqda\n\n"
+    result += f"Foydalanuvchi: {full_name}\n"
+    result += f"Telefon raqam: {phone_number}\n"
+    result += f"Manzil: https://www.google.com/maps?q={lat_long}\n"
+    result += f"Viloyat: {region}\n"
+    result += f"Shahar: {district}\n\n"
+
+    total_price = 0
+    for product_name, count, price in lines:
+        result += "Buyurtma:\n"
+        result += f"Nomi: {product_name}\n"
+        result += f"Miqdori: {count}\n"
+        result += f"Umumiy summa: {format_price(price)}\n\n"
+        total_price += price
+
+    result += f"Jami narx: {format_price(total_price)}"
+    return result
+
+
+def get_my_orders_text(orders: Iterable, user_lang: str) -> str:
+    # Links are put in after transliteration, so they stay as they are
+    msg = default_languages[user_lang]["order"] + '\n\n'
+    lat_longs = []
+    for order in orders:
+        msg += f"Buyurtma #{order.id}\n"
+        msg += "Holati: TO'LANGAN\n"
+        msg += "Manzil: {}\n"
+        msg += f"Jami narx: {format_price(order.total_price)}\n"
+        msg += f"Buyurtma berilgan sana: {order.created_at}\n\n"
+        lat_longs.append(f"https://www.google.com/maps?q={order.lat_long}")
+    return transliterate(msg, user_lang).format(*lat_longs)
+
+
+def get_sales_report_text(products: Sequence, districts: Sequence, hours: Sequence, days: int, top: int) -> str:
+    # Admins read Latin only, like the rest of the admin panel
+    msg = f"Oxirgi {days} kunlik sotuv hisoboti\n\n"
+    if not districts:
+        return msg + "Buyurtmalar yo'q"
+
+    unknown = "Noma'lum"
+
+    def name(sales) -> str:
+        return sales.product_name or "O'chirilgan mahsulot"
+
+    msg += "Eng ko'p tushum keltirgan mahsulotlar:\n"
+    for n, sales in enumerate(products[:top], start=1):
+        msg += f"{n}. {name(sales)}: {format_price(sales.revenue)} ({sales.count}-ta)\n"
+
+    msg += "\nEng ko'p sotilgan mahsulotlar:\n"
+    for n, sales in enumerate(sorted(products, key=lambda sales: sales.count, reverse=True)[:top], start=1):
+        msg += f"{n}. {name(sales)}: {sales.count}-ta\n"
+
+    # Every district would not fit in a message, regions are summed up from them
+    by_region = {}
+    for sales in districts:
+        orders, revenue = by_region.get(sales.region, (0, 0))
+        by_region[sales.region] = (orders + sales.orders, revenue + sales.revenue)
+
+    msg += "\nViloyatlar bo'yicha:\n"
+    for region, (orders, revenue) in sorted(by_region.items(), key=lambda item: item[1][1], reverse=True):
+        msg += f"- {region or unknown}: {orders}-ta buyurtma, {format_price(revenue)}\n"
+
+    msg += "\nEng faol tumanlar:\n"
+    for n, sales in enumerate(districts[:top], start=1):
+        place = ", ".join(part for part in (sales.region, sales.district) if part) or unknown
+        msg += f"{n}. {place}: {sales.orders}-ta buyurtma, {format_price(sales.revenue)}\n"
+
+    msg += "\nSoatlar bo'yicha buyurtmalar:\n"
+    # Districts and hours are cached apart, so hours may be empty while districts are not
+    busiest = max((sales.orders for sales in hours), default=1)
+    for sales in hours:
+        bar = "▇" * max(1, round(10 * sales.orders / busiest))
+        msg += f"{sales.hour:02d}:00 {bar} {sales.orders}\n"
+    return msg
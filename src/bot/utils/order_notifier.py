@@ -0,0 +1,121 @@
+"""This file contains delivery of new orders to the couriers group.
+
+Checkout only appends a notification to a Redis stream, a background consumer
+sends it to the group. Entries are acknowledged after a successful send, so
+notifications which were not delivered before a restart are sent again.
+"""
+import asyncio
+import logging
+from typing import Any
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+from redis.asyncio.client import Redis
+from redis.exceptions import ResponseError
+
+from src.bot.structures.keyboards import common
+from src.configuration import conf
+
+logger = logging.getLogger(__name__)
+
+
+class OrderNotifier:
+    """Publisher and consumer of the order notifications stream."""
+
+    stream = 'orders:notifications'
+    group = 'couriers'
+
+    def __init__(
+        self,
+        redis: Redis,
+        chat_id: int = conf.bot.orders_chat_id,
+        consumer: str = conf.bot.orders_consumer,
+        retry_delay: float = 5.0,
+        max_len: int = 10_000,
+    ):
+        """Initialize order notifier.
+
+        :param redis: Redis client instance
+        :param chat_id: Couriers group chat id
+        :param consumer: Consumer name, keep it stable between restarts to pick
+        up own unacknowledged entries
+        :param retry_delay: Seconds to wait before failed sends are retried
+        :param max_len: Approximate count of entries kept in the stream.
+        """
+        self.redis = redis
+        self.chat_id = chat_id
+        self.consumer = consumer
+        self.retry_delay = retry_delay
+        self.max_len = max_len
+
+    async def publish(self, text: str, **fields: Any) -> None:
+        """Append a notification to the stream.
+
+        :param text: Text of the group message
+        :param fields: Extra fields stored along with the text.
+        """
+        await self.redis.xadd(
+            self.stream, {'text': text, **fields}, maxlen=self.max_len, approximate=True
+        )
+
+    async def run(self, bot: Bot) -> None:
+        """Deliver notifications until cancelled."""
+        await self._create_group()
+        while True:
+            try:
+                # Unacknowledged entries go first, then wait for the new ones
+                entries = await self._read(pending=True) or await self._read(pending=False)
+                delivered = [await self._deliver(bot, fields) for _, fields in entries]
+                acked = [entry_id for (entry_id, _), ok in zip(entries, delivered) if ok]
+                if acked:
+                    await self.redis.xack(self.stream, self.group, *acked)
+                if not all(delivered):
+                    await asyncio.sleep(self.retry_delay)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Order notifications consumer failed')
+                await asyncio.sleep(self.retry_delay)
+
+    async def _create_group(self) -> None:
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id='0', mkstream=True)
+        except ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+
+    async def _read(self, pending: bool) -> list[tuple[bytes, dict[bytes, bytes]]]:
+        response = await self.redis.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: '0' if pending else '>'},
+            count=10,
+            block=None if pending else 5000,
+        )
+        if not response:
+            return []
+        return response[0][1]
+
+    async def _deliver(self, bot: Bot, fields: dict[bytes, bytes]) -> bool:
+        """Send one notification.
+
+        :return: Whether the entry can be acknowledged.
+        """
+        if not fields:
+            # Entry was trimmed from the stream before it was delivered
+            return True
+        order_id = fields.get(b'order_id')
+        try:
+            await bot.send_message(
+                chat_id=self.chat_id,
+                text=fields[b'text'].decode(),
+                reply_markup=common.get_order(int(order_id) if order_id else None),
+            )
+        except (TelegramBadRequest, TelegramForbiddenError):
+            # Retrying will not help, drop the entry
+            logger.exception('Order notification was rejected: %s', fields)
+            return True
+        except Exception:
+            logger.exception('Order notification was not sent, will retry')
+            return False
+        return True
@@ -1,33 +1,106 @@
 """ This file contains the cache adapter """
 import asyncio
-from typing import Any, List, Optional, TypeVar, overload, final
+import logging
+from contextlib import asynccontextmanager
+from typing import (
+    Any, AsyncIterator, Dict, List, Optional, Sequence, TypeVar, overload, final
+)
 
-from redis.asyncio.client import Redis
+from redis.asyncio.client import Pipeline, Redis
+from redis.asyncio.connection import ConnectionPool
 
+from src.cache.cart import CartStore
+from src.cache.local import LocalStore
+from src.cache.namespace import CART, CATALOG, LANG, SETTINGS, default_ttl
+from src.cache.pool import PoolStats, build_connection_pool, pool_stats
 from src.configuration import conf
 from src.language.translator import LocaleScheme
 
 KeyLike = TypeVar("KeyLike", str, LocaleScheme)
 
+INVALIDATION_CHANNEL = "cache:invalidate"
 
-def build_redis_client() -> Redis:
-    """Build redis client"""
-    client = Redis(
-        host=conf.redis.host,
-        db=conf.redis.db,
-        port=conf.redis.port,
-        password=conf.redis.passwd,
-        username=conf.redis.username,
-    )
-    asyncio.create_task(client.ping())
-    return client
+logger = logging.getLogger(__name__)
+
+
+def build_redis_client(pool: Optional[ConnectionPool] = None) -> Redis:
+    """
+    Build redis client
+    :param pool: (Optional) Connection pool to share, a new one is built from
+    configuration by default
+    :return: Client
+    """
+    return Redis(connection_pool=pool or build_connection_pool())
+
+
+class CachePipeline:
+    """Commands queued here are sent to Redis in one round-trip"""
+
+    def __init__(self, pipe: Pipeline, cache: "Cache"):
+        self.pipe = pipe
+        self.cache = cache
+        self.results: List[Any] = []
+        self._invalidated: List[str] = []
+
+    def get(self, key: KeyLike) -> "CachePipeline":
+        """Queue getting a value"""
+        self.pipe.get(str(key))
+        return self
+
+    def set(self, key: KeyLike, value: Any, ttl: Optional[int] = None) -> "CachePipeline":
+        """Queue setting a value, the key's namespace gives the default time to live"""
+        self.pipe.set(name=str(key), value=value, ex=ttl or default_ttl(str(key)))
+        if self.cache.is_tracked(str(key)):
+            self.pipe.publish(INVALIDATION_CHANNEL, str(key))
+            self._invalidated.append(str(key))
+        return self
+
+    def exists(self, key: KeyLike) -> "CachePipeline":
+        """Queue checking a key"""
+        self.pipe.exists(str(key))
+        return self
+
+    async def execute(self) -> List[Any]:
+        """
+        Send queued commands
+        :return: Results in order of queued commands
+        """
+        results = await self.pipe.execute()
+        for key in self._invalidated:
+            self.cache.local.invalidate(key)
+        self._invalidated = []
+        self.results = results
+        return self.results
 
 
 class Cache:
     """Cache adapter"""
 
-    def __init__(self, redis: Optional[Redis] = None):
+    def __init__(
+        self,
+        redis: Optional[Redis] = None,
+        tracked_prefixes: Sequence[str] = (LANG.prefix, SETTINGS.prefix, CATALOG.prefix),
+        local_ttl: float = conf.redis.local_cache_ttl,
+        local_size: int = conf.redis.local_cache_size,
+    ):
+        """
+        :param redis: Redis client
+        :param tracked_prefixes: Keys starting with these prefixes are read far
+        more often than written, so their values are also kept in process memory
+        while `listen_invalidations` is running
+        :param local_ttl: Upper bound for a local copy's age in seconds
+        :param local_size: Max count of local copies
+        """
         self.client = redis or build_redis_client()
+        self.cart = CartStore(self.client, ttl=CART.ttl)
+        self.tracked_prefixes = tuple(tracked_prefixes)
+        self.local = LocalStore(ttl=local_ttl, max_size=local_size)
+        self.tracking = False
+        """ Local copies are only used while invalidations are received """
+
+    def is_tracked(self, key: str) -> bool:
+        """Whether the key is kept in process memory"""
+        return key.startswith(self.tracked_prefixes)
 
     @property
     def redis_client(self) -> Redis:
@@ -37,6 +110,13 @@ class Cache:
         """
         return self.client
 
+    def pool_stats(self) -> PoolStats:
+        """
+        Usage of the connection pool behind the client
+        :return: Stats
+        """
+        return pool_stats(self.client.connection_pool)
+
     @final
     async def get(self, key: KeyLike) -> bytes:
         """
@@ -44,17 +124,114 @@ class Cache:
         :param key:
         :return: Value
         """
-        return await self.client.get(str(key))
+        key = str(key)
+        if not (self.tracking and self.is_tracked(key)):
+            return await self.client.get(key)
+
+        hit, value = self.local.get(key)
+        if not hit:
+            generation = self.local.generation
+            value = await self.client.get(key)
+            self.local.put(key, value, generation)
+        return value
 
     @final
-    async def set(self, key: KeyLike, value: Any):
+    async def set(self, key: KeyLike, value: Any, ttl: Optional[int] = None):
         """
         Set a value to cache database
         :param key: Key to set
         :param value: Value in a serializable type
+        :param ttl: (Optional) Time to live in seconds, the key's namespace
+        gives the default
         :return: Nothing
         """
-        await self.client.set(name=str(key), value=value)  # noqa
+        key = str(key)
+        ttl = ttl or default_ttl(key)
+        if not self.is_tracked(key):
+            await self.client.set(name=key, value=value, ex=ttl)  # noqa
+            return
+
+        # Other bot instances drop their local copies on this message
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.set(name=key, value=value, ex=ttl)
+            pipe.publish(INVALIDATION_CHANNEL, key)
+            await pipe.execute()
+        self.local.invalidate(key)
+
+    @final
+    async def delete(self, *keys: KeyLike):
+        """
+        Delete keys from cache database
+        :param keys: Keys to delete
+        :return: Nothing
+        """
+        keys = [str(key) for key in keys]
+        tracked = [key for key in keys if self.is_tracked(key)]
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.delete(*keys)
+            for key in tracked:
+                pipe.publish(INVALIDATION_CHANNEL, key)
+            await pipe.execute()
+        for key in tracked:
+            self.local.invalidate(key)
+
+    @final
+    async def get_many(self, *keys: KeyLike) -> List[Optional[bytes]]:
+        """
+        Get many values from cache database in one round-trip
+        :param keys:
+        :return: Values in order of keys, None for missing ones
+        """
+        keys = [str(key) for key in keys]
+        if not self.tracking:
+            return await self.client.mget(keys)
+
+        values: Dict[str, Any] = {}
+        for key in keys:
+            if self.is_tracked(key):
+                hit, value = self.local.get(key)
+                if hit:
+                    values[key] = value
+
+        missing = [key for key in keys if key not in values]
+        if missing:
+            generation = self.local.generation
+            for key, value in zip(missing, await self.client.mget(missing)):
+                values[key] = value
+                if self.is_tracked(key):
+                    self.local.put(key, value, generation)
+        return [values[key] for key in keys]
+
+    @final
+    async def set_many(self, mapping: Dict[KeyLike, Any], ttl: Optional[int] = None):
+        """
+        Set many values to cache database in one round-trip
+        :param mapping: Keys and values in a serializable type
+        :param ttl: (Optional) Time to live in seconds, the keys' namespaces
+        give the default
+        :return: Nothing
+        """
+        async with self.pipeline() as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, ttl=ttl)
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[CachePipeline]:
+        """
+        Batch commands, they are sent when the block exits
+
+        Example:
+        >> async with cache.pipeline() as pipe:
+        >>     pipe.get(lang_key).get("min_sum")
+        >> lang, min_sum = pipe.results
+
+        :param transaction: Wrap commands into MULTI/EXEC
+        :return: Pipeline to queue commands in
+        """
+        async with self.client.pipeline(transaction=transaction) as pipe:
+            cache_pipe = CachePipeline(pipe, cache=self)
+            yield cache_pipe
+            await cache_pipe.execute()
 
     @overload
     async def exists(self, key: KeyLike):
@@ -78,4 +255,30 @@ class Cache:
         if not isinstance(keys, list):
             return await self.client.exists(str(keys))
         else:
-            return await self.client.exists(*map(str, keys))
\ No newline at end of file
+            return await self.client.exists(*map(str, keys))
+
+    async def listen_invalidations(self):
+        """
+        Receive invalidations of tracked keys until cancelled
+        Local copies are used only while this is running
+        :return: Nothing
+        """
+        while True:
+            pubsub = self.client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything could change while we were not subscribed
+                self.local.clear()
+                self.tracking = True
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.local.invalidate(message["data"].decode())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Cache invalidations listener failed")
+            finally:
+                self.tracking = False
+                self.local.clear()
+                await pubsub.reset()
+            await asyncio.sleep(1)
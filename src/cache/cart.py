@@ -0,0 +1,94 @@
+""" This file contains the cart store """
+from typing import NamedTuple, Optional
+
+from redis.asyncio.client import Redis
+
+from src.cache.namespace import CART
+
+
+class CartItem(NamedTuple):
+    """One product line of a cart"""
+
+    product_id: int
+    total_count: int
+    total_price: int
+
+
+class CartStore:
+    """Shopping carts kept in one Redis hash per user
+
+    Hash fields are ``<product_id>:count`` and ``<product_id>:price``, so adding
+    the same product again only increments them.
+    """
+
+    def __init__(self, redis: Redis, ttl: Optional[int] = None):
+        """
+        :param redis: Redis client
+        :param ttl: (Optional) Carts which were not changed for this many
+        seconds are dropped
+        """
+        self.client = redis
+        self.ttl = ttl
+
+    @staticmethod
+    def key(user_id: int) -> str:
+        """Cart key of the user"""
+        return CART.key(user_id)
+
+    async def add(self, user_id: int, product_id: int, total_count: int, total_price: int):
+        """
+        Add product to the cart or increase its count and price
+        :param user_id: Telegram user id
+        :param product_id: Product id
+        :param total_count: Count to add
+        :param total_price: Price to add
+        :return: Nothing
+        """
+        key = self.key(user_id)
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hincrby(key, f"{product_id}:count", total_count)
+            pipe.hincrby(key, f"{product_id}:price", total_price)
+            if self.ttl:
+                pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    async def get_items(self, user_id: int) -> list[CartItem]:
+        """
+        Get all product lines of the cart
+        :param user_id: Telegram user id
+        :return: Cart lines in order of product id
+        """
+        fields = await self.client.hgetall(self.key(user_id))
+        items: dict[int, dict[str, int]] = {}
+        for field, value in fields.items():
+            product_id, _, name = field.decode().partition(":")
+            items.setdefault(int(product_id), {})[name] = int(value)
+
+        return [
+            CartItem(
+                product_id=product_id,
+                total_count=values.get("count", 0),
+                total_price=values.get("price", 0),
+            )
+            for product_id, values in sorted(items.items())
+        ]
+
+    async def remove(self, user_id: int, *product_ids: int):
+        """
+        Remove product lines from the cart
+        :param user_id: Telegram user id
+        :param product_ids: Ids of the products to remove
+        :return: Nothing
+        """
+        if not product_ids:
+            return
+        fields = [f"{product_id}:{name}" for product_id in product_ids for name in ("count", "price")]
+        await self.client.hdel(self.key(user_id), *fields)
+
+    async def clear(self, user_id: int):
+        """
+        Remove the cart
+        :param user_id: Telegram user id
+        :return: Nothing
+        """
+        await self.client.delete(self.key(user_id))
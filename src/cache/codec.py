@@ -0,0 +1,184 @@
+""" This file contains codecs which turn values into cache bytes and back """
+import abc
+import datetime
+import decimal
+import enum
+import json
+from typing import Any, Dict, Generic, List, Sequence, TypeVar, get_type_hints
+
+import msgpack
+import sqlalchemy as sa
+
+T = TypeVar("T")
+
+
+class Codec(abc.ABC, Generic[T]):
+    """Codec interface"""
+
+    @abc.abstractmethod
+    def encode(self, value: T) -> bytes:
+        """Turn value into bytes"""
+
+    @abc.abstractmethod
+    def decode(self, data: bytes) -> T:
+        """Turn bytes back into value"""
+
+
+def dump_value(value: Any) -> Any:
+    """Turn enums, dates and decimals into plain values msgpack and JSON can store"""
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+class JsonCodec(Codec[Any]):
+    """Codec for JSON serializable values"""
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgpackCodec(Codec[Any]):
+    """Compact binary codec
+
+    Values which were written as JSON before are still decoded.
+    """
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        try:
+            return msgpack.unpackb(data, raw=False, strict_map_key=False)
+        except (msgpack.ExtraData, ValueError):
+            return json.loads(data)
+
+
+class SchemaCodec(Codec[Dict[str, Any]]):
+    """Msgpack codec for dicts with known keys
+
+    Known keys are stored as their small integer index instead of the name.
+    Append new fields to the end only, changing the order breaks stored data.
+    Unknown keys are stored as is.
+    """
+
+    def __init__(self, fields: Sequence[str]):
+        self.fields = tuple(fields)
+        self.field_ids = {name: index for index, name in enumerate(self.fields)}
+        self.msgpack = MsgpackCodec()
+
+    def encode(self, value: Dict[str, Any]) -> bytes:
+        return self.msgpack.encode(
+            {self.field_ids.get(key, key): item for key, item in value.items()}
+        )
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        return {
+            self.fields[key] if isinstance(key, int) else key: item
+            for key, item in self.msgpack.decode(data).items()
+        }
+
+
+FSM_FIELDS = (
+    # OrderGroup
+    "product_id",
+    "product_price",
+    "region",
+    "district",
+    # RegisterGroup
+    "language",
+    "fullname",
+    # AdminGroup
+    "product_name",
+)
+
+fsm_codec = SchemaCodec(FSM_FIELDS)
+""" Codec of FSM data, see `src.cache.storage.CodecRedisStorage` """
+
+
+class ModelCodec(Codec[T]):
+    """Codec for ORM entities
+
+    Only column values are stored. Decoded entities are transient copies which
+    are not bound to any session.
+    """
+
+    def __init__(self, model: type[T], values_codec: Codec[Any] = MsgpackCodec()):
+        self.model = model
+        self.values_codec = values_codec
+        self.columns = {
+            attr.key: attr.columns[0].type for attr in sa.inspect(model).column_attrs
+        }
+
+    def encode(self, value: T) -> bytes:
+        return self.values_codec.encode(self.dump(value))
+
+    def decode(self, data: bytes) -> T:
+        return self.load(self.values_codec.decode(data))
+
+    def dump(self, value: T) -> Dict[str, Any]:
+        """Column values of the entity as a dict of plain values"""
+        return {key: dump_value(getattr(value, key)) for key in self.columns}
+
+    def load(self, data: Dict[str, Any]) -> T:
+        """Build entity back from `dump` result"""
+        return self.model(
+            **{
+                key: self._load_value(self.columns[key], value)
+                for key, value in data.items()
+                if key in self.columns
+            }
+        )
+
+    @staticmethod
+    def _load_value(column_type: sa.types.TypeEngine, value: Any) -> Any:
+        if value is None:
+            return None
+        if isinstance(column_type, sa.Enum) and column_type.enum_class is not None:
+            return column_type.enum_class[value]
+        if isinstance(column_type, sa.DateTime):
+            return datetime.datetime.fromisoformat(value)
+        if isinstance(column_type, sa.Date):
+            return datetime.date.fromisoformat(value)
+        if isinstance(column_type, sa.Numeric) and not isinstance(column_type, sa.Float):
+            return decimal.Decimal(value)
+        return value
+
+
+class RowsCodec(Codec[List[T]]):
+    """Codec for lists of named tuples
+
+    Rows are stored as lists of values, fields annotated as Decimal or
+    datetime are restored from their text.
+    """
+
+    def __init__(self, row_type: type[T], values_codec: Codec[Any] = MsgpackCodec()):
+        self.row_type = row_type
+        self.values_codec = values_codec
+        self.loaders = [self._loader(hint) for hint in get_type_hints(row_type).values()]
+
+    def encode(self, value: List[T]) -> bytes:
+        return self.values_codec.encode([[dump_value(item) for item in row] for row in value])
+
+    def decode(self, data: bytes) -> List[T]:
+        return [
+            self.row_type(*(item if item is None else load(item) for load, item in zip(self.loaders, row)))
+            for row in self.values_codec.decode(data)
+        ]
+
+    @staticmethod
+    def _loader(hint: Any) -> Any:
+        if hint is decimal.Decimal:
+            return decimal.Decimal
+        if hint is datetime.datetime:
+            return datetime.datetime.fromisoformat
+        if hint is datetime.date:
+            return datetime.date.fromisoformat
+        return lambda item: item
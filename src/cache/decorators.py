@@ -0,0 +1,78 @@
+""" This file contains the cache-aside decorator for repository methods """
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from src.cache.codec import Codec, MsgpackCodec
+from src.cache.singleflight import SingleFlight
+
+T = TypeVar("T")
+
+
+def cached(
+    key: str, ttl: Optional[int] = None, codec: Codec = MsgpackCodec()
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Cache the result of a repository method in Redis
+
+    The repository has to have a ``cache`` attribute, the method is called
+    directly when it is None. Concurrent misses of the same key run the method
+    once, on the session of ``shared()`` rather than the caller's one, so
+    callers which are cancelled or done don't break the load for the others.
+    None results are not cached.
+
+    Example:
+    >> @cached(key="user:{user_id}", codec=ModelCodec(User))
+    >> async def get_me(self, user_id: int) -> User: ...
+    >> await UserRepo.get_me.invalidate(self, user_id)
+
+    :param key: Key template, formatted with the method's arguments
+    :param ttl: (Optional) Time to live in seconds, the key's namespace gives
+    the default
+    :param codec: Codec of the result
+    :return: Decorator
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        signature = inspect.signature(func)
+        flights = SingleFlight()
+
+        def build_key(*args: Any, **kwargs: Any) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return key.format(**bound.arguments)
+
+        @functools.wraps(func)
+        async def wrapper(self, *args: Any, **kwargs: Any) -> T:
+            cache = getattr(self, "cache", None)
+            if cache is None:
+                return await func(self, *args, **kwargs)
+
+            cache_key = build_key(self, *args, **kwargs)
+
+            async def load() -> T:
+                data = await cache.get(cache_key)
+                if data is not None:
+                    return codec.decode(data)
+                async with self.shared() as repository:
+                    value = await func(repository, *args, **kwargs)
+                    if value is None:
+                        return value
+                    data = codec.encode(value)
+                await cache.set(cache_key, data, ttl=ttl)
+                # Everyone gets a copy, never an entity bound to another session
+                return codec.decode(data)
+
+            return await flights.do(cache_key, load)
+
+        async def invalidate(self, *args: Any, **kwargs: Any):
+            """Drop the cached result for these arguments"""
+            cache = getattr(self, "cache", None)
+            if cache is not None:
+                await cache.delete(build_key(self, *args, **kwargs))
+
+        wrapper.invalidate = invalidate
+        wrapper.build_key = build_key
+        return wrapper
+
+    return decorator
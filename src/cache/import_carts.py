@@ -0,0 +1,67 @@
+""" This file moves carts left in the legacy cart table into Redis
+
+Usage:
+    python -m src.cache.import_carts [--batch 500]
+
+Run it once after deploying Redis carts. Active cart lines are deleted from
+Postgres in batches and added to the users' cart hashes, merging with what is
+already there. A batch is committed only after Redis took it, so a failure
+may at worst add the last batch twice when the command is run again.
+"""
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache.adapter import build_redis_client
+from src.cache.cart import CartStore
+from src.cache.namespace import CART
+from src.cache.pool import build_connection_pool
+from src.configuration import conf
+from src.db.database import create_async_engine
+from src.db.repositories.cart import CartRepo
+
+logger = logging.getLogger(__name__)
+
+
+async def import_carts(session: AsyncSession, carts: CartStore, batch: int = 500) -> int:
+    """
+    Move active cart lines from Postgres into Redis
+    :param session: Database session
+    :param carts: Cart store
+    :param batch: Cart lines moved per transaction
+    :return: Count of moved lines
+    """
+    repository = CartRepo(session)
+    moved = 0
+    while True:
+        lines = await repository.pop_active(limit=batch)
+        for user_id, product_id, total_count, total_price in lines:
+            await carts.add(user_id, product_id, total_count or 0, int(total_price or 0))
+        await session.commit()
+        moved += len(lines)
+        if len(lines) < batch:
+            return moved
+
+
+async def main(batch: int) -> None:
+    engine = create_async_engine(url=conf.db.build_connection_str())
+    pool = build_connection_pool()
+    redis = build_redis_client(pool)
+    try:
+        async with AsyncSession(bind=engine) as session:
+            moved = await import_carts(session, CartStore(redis, ttl=CART.ttl), batch=batch)
+        logger.info("Moved %s cart lines into Redis", moved)
+    finally:
+        await redis.close()
+        await pool.disconnect()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Move carts from the cart table into Redis")
+    parser.add_argument("--batch", type=int, default=500, help="cart lines per transaction")
+    args = parser.parse_args()
+    asyncio.run(main(batch=args.batch))
@@ -0,0 +1,58 @@
+""" This file contains the in-process store for hot cache keys """
+import time
+from typing import Any, Dict, Tuple
+
+
+class LocalStore:
+    """In-process copies of Redis values
+
+    Entries are dropped when an invalidation for their key arrives. The time to
+    live only limits the damage of an invalidation which was lost.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.data: Dict[str, Tuple[float, Any]] = {}
+        self.generation = 0
+        """ Increased by every invalidation, see `put` """
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Get a local copy
+        :param key:
+        :return: (hit, value)
+        """
+        item = self.data.get(key)
+        if item is None:
+            return False, None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self.data[key]
+            return False, None
+        return True, value
+
+    def put(self, key: str, value: Any, generation: int):
+        """
+        Store a value read from Redis
+        :param key:
+        :param value:
+        :param generation: Generation taken before the value was read. If any
+        invalidation happened since then the value may be stale and is skipped
+        :return: Nothing
+        """
+        if generation != self.generation:
+            return
+        if key not in self.data and len(self.data) >= self.max_size:
+            del self.data[next(iter(self.data))]
+        self.data[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: str):
+        """Drop a local copy"""
+        self.data.pop(key, None)
+        self.generation += 1
+
+    def clear(self):
+        """Drop all local copies"""
+        self.data.clear()
+        self.generation += 1
@@ -0,0 +1,58 @@
+""" This file contains key namespaces of the cache """
+from typing import Any, NamedTuple, Optional, Tuple
+
+from src.configuration import conf
+
+
+class Namespace(NamedTuple):
+    """Family of keys sharing a prefix and a default time to live"""
+
+    name: str
+    prefix: str
+    ttl: Optional[int] = None
+    """ Applied when a key is set without an explicit time to live """
+
+    def key(self, *parts: Any) -> str:
+        """Build a key of this namespace"""
+        return self.prefix + ":".join(map(str, parts))
+
+
+# Prefixes of the keys written before namespaces existed are kept as they are,
+# so the data of a running deployment stays readable
+LANG = Namespace("lang", "lang_", ttl=conf.redis.lang_ttl)
+SETTINGS = Namespace("settings", "min_sum")
+CART = Namespace("cart", "cart:", ttl=conf.redis.cart_ttl)
+USER = Namespace("user", "user:", ttl=conf.redis.user_ttl)
+PRODUCT = Namespace("product", "product:", ttl=conf.redis.product_ttl)
+CATALOG = Namespace("catalog", "catalog:", ttl=conf.redis.product_ttl)
+""" Rendered product keyboard pages, by language and page """
+FSM = Namespace("fsm", "fsm:", ttl=conf.redis.state_ttl)
+""" Written by aiogram's storage, its own state and data TTLs apply """
+REPORT = Namespace("report", "report:", ttl=conf.redis.report_ttl)
+""" Aggregates of the admin sales report, only expire """
+ORDERS = Namespace("orders", "orders:")
+""" Streams, trimmed by length instead of time """
+
+NAMESPACES: Tuple[Namespace, ...] = (LANG, SETTINGS, CART, USER, PRODUCT, CATALOG, REPORT, FSM, ORDERS)
+
+
+def namespace_of(key: str) -> Optional[Namespace]:
+    """
+    Find the namespace of a key
+    :param key:
+    :return: Namespace or None for unknown keys
+    """
+    for namespace in NAMESPACES:
+        if key.startswith(namespace.prefix):
+            return namespace
+    return None
+
+
+def default_ttl(key: str) -> Optional[int]:
+    """
+    Default time to live of a key
+    :param key:
+    :return: Seconds or None to keep the key forever
+    """
+    namespace = namespace_of(key)
+    return namespace.ttl if namespace else None
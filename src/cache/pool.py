@@ -0,0 +1,79 @@
+""" This file contains the Redis connection pool shared by the whole process """
+import asyncio
+import logging
+from typing import NamedTuple
+
+from redis.asyncio.connection import BlockingConnectionPool, ConnectionPool
+
+from src.configuration import conf
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats(NamedTuple):
+    """Connection pool usage"""
+
+    max_connections: int
+    in_use: int
+    idle: int
+
+    @property
+    def usage(self) -> float:
+        """Share of the pool which is in use"""
+        return self.in_use / self.max_connections
+
+
+def build_connection_pool() -> BlockingConnectionPool:
+    """
+    Build connection pool from configuration
+
+    No socket read timeout is set on purpose, the pool is shared with blocking
+    stream reads and the pub/sub listener. Dead connections are found by TCP
+    keepalive and by a PING before a connection idle for too long is reused.
+    :return: Pool which waits for a free connection instead of failing
+    """
+    return BlockingConnectionPool(
+        host=conf.redis.host,
+        port=conf.redis.port,
+        db=conf.redis.db or 0,
+        username=conf.redis.username,
+        password=conf.redis.passwd,
+        max_connections=conf.redis.max_connections,
+        timeout=conf.redis.pool_timeout,
+        health_check_interval=conf.redis.health_check_interval,
+        socket_connect_timeout=conf.redis.socket_connect_timeout,
+        socket_keepalive=conf.redis.socket_keepalive,
+    )
+
+
+def pool_stats(pool: ConnectionPool) -> PoolStats:
+    """
+    Take a snapshot of pool usage
+    :param pool:
+    :return: Stats
+    """
+    return PoolStats(
+        max_connections=pool.max_connections,
+        in_use=len(pool._in_use_connections),
+        idle=len(pool._available_connections),
+    )
+
+
+async def report_pool_usage(
+    pool: ConnectionPool, interval: float = 60, warn_usage: float = 0.8
+):
+    """
+    Log pool usage until cancelled
+    :param pool:
+    :param interval: Seconds between reports
+    :param warn_usage: Usage share which is reported as a warning
+    :return: Nothing
+    """
+    while True:
+        await asyncio.sleep(interval)
+        stats = pool_stats(pool)
+        logger.log(
+            logging.WARNING if stats.usage >= warn_usage else logging.DEBUG,
+            "Redis pool: %s in use, %s idle of %s",
+            stats.in_use, stats.idle, stats.max_connections,
+        )
@@ -0,0 +1,34 @@
+""" This file contains coalescing of concurrent identical calls """
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one in-flight awaitable"""
+
+    def __init__(self):
+        self.calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run func unless a call with the same key is already running, then wait for it
+        :param key: Identity of the call
+        :param func: Coroutine function to run
+        :return: Result of the leading call
+        """
+        future = self.calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self.calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        # One waiter being cancelled must not cancel the call for the others
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self.calls.get(key) is future:
+            del self.calls[key]
+        if not future.cancelled():
+            # Mark exception as retrieved even if every waiter went away
+            future.exception()
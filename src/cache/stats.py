@@ -0,0 +1,119 @@
+""" This file contains a report of keys and memory per cache namespace
+
+Usage:
+    python -m src.cache.stats [--batch 1000] [--samples 5]
+
+Keys are walked with SCAN, so the report is safe to run against a live Redis,
+but it is approximate while keys are being written.
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List
+
+from redis.asyncio.client import Redis
+
+from src.cache.adapter import build_redis_client
+from src.cache.namespace import NAMESPACES, namespace_of
+from src.cache.pool import build_connection_pool
+
+OTHER = "other"
+
+
+@dataclass
+class NamespaceStats:
+    """Keys and memory of one namespace"""
+
+    keys: int = 0
+    memory: int = 0
+    """ Bytes reported by MEMORY USAGE """
+    persistent: int = 0
+    """ Keys without a time to live """
+
+
+async def collect(redis: Redis, batch: int = 1000, samples: int = 5) -> Dict[str, NamespaceStats]:
+    """
+    Walk all keys and sum them up per namespace
+    :param redis: Redis client
+    :param batch: Keys requested per SCAN call
+    :param samples: Nested values sampled by MEMORY USAGE, 0 samples all
+    :return: Stats by namespace name, unknown keys are counted as "other"
+    """
+    stats = {namespace.name: NamespaceStats() for namespace in NAMESPACES}
+    stats[OTHER] = NamespaceStats()
+
+    cursor = 0
+    while True:
+        cursor, keys = await redis.scan(cursor=cursor, count=batch)
+        if keys:
+            await _account(redis, keys, stats, samples)
+        if cursor == 0:
+            return stats
+
+
+async def _account(
+    redis: Redis, keys: List[bytes], stats: Dict[str, NamespaceStats], samples: int
+) -> None:
+    async with redis.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.memory_usage(key, samples=samples)
+            pipe.ttl(key)
+        results = await pipe.execute()
+
+    for key, memory, ttl in zip(keys, results[::2], results[1::2]):
+        if memory is None:
+            # Expired between SCAN and MEMORY USAGE
+            continue
+        namespace = namespace_of(key.decode(errors="replace"))
+        item = stats[namespace.name if namespace else OTHER]
+        item.keys += 1
+        item.memory += memory
+        item.persistent += ttl == -1
+
+
+def format_size(size: float) -> str:
+    """Human readable size"""
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def format_report(stats: Dict[str, NamespaceStats], used_memory: int) -> str:
+    """
+    Render stats as a table
+    :param stats: Stats by namespace name
+    :param used_memory: Memory used by the whole Redis instance
+    :return: Report text
+    """
+    lines = [f"{'namespace':<10} {'keys':>10} {'memory':>12} {'avg':>10} {'no ttl':>10}"]
+    for name, item in stats.items():
+        avg = item.memory / item.keys if item.keys else 0
+        lines.append(
+            f"{name:<10} {item.keys:>10} {format_size(item.memory):>12} "
+            f"{format_size(avg):>10} {item.persistent:>10}"
+        )
+    total = sum(item.memory for item in stats.values())
+    lines.append(f"keys total {format_size(total)}, instance uses {format_size(used_memory)}")
+    return "\n".join(lines)
+
+
+async def main(batch: int, samples: int) -> None:
+    pool = build_connection_pool()
+    redis = build_redis_client(pool)
+    try:
+        stats = await collect(redis, batch=batch, samples=samples)
+        info = await redis.info("memory")
+        print(format_report(stats, used_memory=info["used_memory"]))
+    finally:
+        await redis.close()
+        await pool.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report Redis keys and memory per namespace")
+    parser.add_argument("--batch", type=int, default=1000, help="keys per SCAN call")
+    parser.add_argument("--samples", type=int, default=5, help="MEMORY USAGE samples, 0 for all")
+    args = parser.parse_args()
+    asyncio.run(main(batch=args.batch, samples=args.samples))
@@ -0,0 +1,25 @@
+""" This file contains the FSM storage with pluggable codec """
+from typing import Any, Dict
+
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.redis import RedisStorage
+
+from src.cache.codec import Codec, fsm_codec
+
+
+class CodecRedisStorage(RedisStorage):
+    """Redis storage which keeps FSM data encoded with a codec
+
+    RedisStorage decodes stored bytes as UTF-8 before loading them, so binary
+    codecs need their own `get_data`.
+    """
+
+    def __init__(self, *args: Any, codec: Codec[Dict[str, Any]] = fsm_codec, **kwargs: Any):
+        super().__init__(*args, json_dumps=codec.encode, **kwargs)
+        self.codec = codec
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        value = await self.redis.get(self.key_builder.build(key, "data"))
+        if value is None:
+            return {}
+        return self.codec.decode(value)
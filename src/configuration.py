@@ -21,6 +21,8 @@ class DatabaseConfig:
     passwd: str | None = getenv('POSTGRES_PASSWORD', None)
     port: int = int(getenv('POSTGRES_PORT', 5432))
     host: str = getenv('POSTGRES_HOST', 'db')
+    shared_sessions: int = int(getenv('POSTGRES_SHARED_SESSIONS', 4))
+    """ Sessions open at once for reads shared by concurrent callers """
 
     driver: str = 'asyncpg'
     database_system: str = 'postgresql'
@@ -47,8 +49,25 @@ class RedisConfig:
     port: int = int(getenv('REDIS_PORT', 6379))
     passwd: str | None = getenv('REDIS_PASSWORD', None)
     username: str | None = getenv('REDIS_USERNAME', None)
-    state_ttl: int | None = getenv('REDIS_TTL_STATE', None)
-    data_ttl: int | None = getenv('REDIS_TTL_DATA', None)
+    state_ttl: int | None = int(getenv('REDIS_TTL_STATE')) if getenv('REDIS_TTL_STATE') else None
+    data_ttl: int | None = int(getenv('REDIS_TTL_DATA')) if getenv('REDIS_TTL_DATA') else None
+    lang_ttl: int = int(getenv('REDIS_TTL_LANG', 30 * 24 * 3600))
+    """ Language keys are restored from the database after they expire """
+    cart_ttl: int = int(getenv('REDIS_TTL_CART', 30 * 24 * 3600))
+    """ Carts nobody touched for this long are dropped """
+    user_ttl: int = int(getenv('REDIS_TTL_USER', 600))
+    product_ttl: int = int(getenv('REDIS_TTL_PRODUCT', 3600))
+    report_ttl: int = int(getenv('REDIS_TTL_REPORT', 300))
+    """ Admin reports are computed again at most this often """
+    max_connections: int = int(getenv('REDIS_MAX_CONNECTIONS', 50))
+    """ Size of the connection pool shared by all Redis users """
+    pool_timeout: float = float(getenv('REDIS_POOL_TIMEOUT', 5))
+    """ Seconds to wait for a free connection when the pool is exhausted """
+    health_check_interval: int = int(getenv('REDIS_HEALTH_CHECK_INTERVAL', 30))
+    socket_connect_timeout: float = float(getenv('REDIS_SOCKET_CONNECT_TIMEOUT', 5))
+    socket_keepalive: bool = getenv('REDIS_SOCKET_KEEPALIVE', '1') == '1'
+    local_cache_ttl: float = float(getenv('REDIS_LOCAL_CACHE_TTL', 60))
+    local_cache_size: int = int(getenv('REDIS_LOCAL_CACHE_SIZE', 100_000))
 
 
 @dataclass
@@ -56,6 +75,30 @@ class BotConfig:
     """Bot configuration."""
 
     token: str = getenv('BOT_TOKEN')
+    orders_chat_id: int = int(getenv('ORDERS_CHAT_ID', -1002256139682))
+    orders_consumer: str = getenv('ORDERS_CONSUMER', 'bot')
+    orders_page_size: int = int(getenv('ORDERS_PAGE_SIZE', 5))
+    products_page_size: int = int(getenv('PRODUCTS_PAGE_SIZE', 8))
+    search_results: int = int(getenv('SEARCH_RESULTS', 20))
+    report_days: int = int(getenv('REPORT_DAYS', 30))
+    """ Days covered by the sales report, today included """
+    report_top: int = int(getenv('REPORT_TOP', 5))
+    utc_offset: int = int(getenv('UTC_OFFSET', 5))
+    """ Hours of the sales report are shifted by it, orders are stored in UTC """
+
+
+@dataclass
+class SendQueueConfig:
+    """Outbound Telegram requests rate limits."""
+
+    global_rate: float = float(getenv('SEND_GLOBAL_RATE', 30))
+    chat_rate: float = float(getenv('SEND_CHAT_RATE', 1))
+    group_rate: float = float(getenv('SEND_GROUP_RATE', 20 / 60))
+    burst: int = int(getenv('SEND_BURST', 3))
+    workers: int = int(getenv('SEND_WORKERS', 8))
+    max_retries: int = int(getenv('SEND_MAX_RETRIES', 3))
+    drain_timeout: float = float(getenv('SEND_DRAIN_TIMEOUT', 10))
+    """ Seconds queued requests are still sent for on shutdown """
 
 
 @dataclass
@@ -77,16 +120,20 @@ class Configuration:
     db = DatabaseConfig()
     redis = RedisConfig()
     bot = BotConfig()
+    send_queue = SendQueueConfig()
     translate = TranslationsConfig()
 
     MEDIA_URL = Path(__file__).parent / "media"
     IMAGE_DIR = Path(__file__).parent / "media" / "images"
-    IMAGE_DIR.mkdir(parents=True, exist_ok=True)
 
     ADMINS = list(map(int, getenv("ADMINS").split(',')))
     SECRET_KEY: str = getenv('SECRET_KEY')
     ADMIN_LOGIN = getenv('ADMIN_LOGIN')
     ADMIN_PASSWORD = getenv('ADMIN_PASSWORD')
+
+    def create_media_dirs(self) -> None:
+        """Create media directories, call it once where media is written."""
+        self.IMAGE_DIR.mkdir(parents=True, exist_ok=True)
     
 
 conf = Configuration()
@@ -4,10 +4,11 @@ from sqlalchemy.engine.url import URL
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine as _create_async_engine
 
+from src.cache import Cache
 from src.configuration import conf
 
 from .repositories import (
-    UserRepo, ProductRepo, OrderRepo, CartRepo
+    UserRepo, ProductRepo, OrderRepo, OrderItemRepo, CartRepo
 )
 
 
@@ -30,6 +31,7 @@ class Database:
     user: UserRepo
     product: ProductRepo
     order: OrderRepo
+    order_item: OrderItemRepo
     cart: CartRepo
 
     session: AsyncSession
@@ -40,14 +42,18 @@ class Database:
         user: UserRepo = None,
         product: ProductRepo = None,
         order: OrderRepo = None,
+        order_item: OrderItemRepo = None,
         cart: CartRepo = None,
+        cache: Cache | None = None,
     ):
         """Initialize Database class.
 
         :param session: AsyncSession to use
+        :param cache: (Optional) Cache for cached repository methods
         """
         self.session = session
-        self.user = user or UserRepo(session=session)
-        self.product = product or ProductRepo(session=session)
-        self.order = user or OrderRepo(session=session)
-        self.cart = user or CartRepo(session=session)
+        self.user = user or UserRepo(session=session, cache=cache)
+        self.product = product or ProductRepo(session=session, cache=cache)
+        self.order = user or OrderRepo(session=session, cache=cache)
+        self.order_item = order_item or OrderItemRepo(session=session, cache=cache)
+        self.cart = user or CartRepo(session=session, cache=cache)
@@ -3,7 +3,8 @@ from .base import Base
 from .user import User
 from .cart import Cart
 from .order import Order
+from .order_item import OrderItem
 from .product import Product
 
 
-__all__ = ( 'Base', 'User', 'Cart', 'Order', 'Product', )
+__all__ = ( 'Base', 'User', 'Cart', 'Order', 'OrderItem', 'Product', )
@@ -10,6 +10,15 @@ from .base import Base
 class Cart(Base):
     """Cart model."""
 
+    __table_args__ = (
+        # A product appears once in the active cart, ordered lines may repeat.
+        # Only active lines are read by user, which this index serves as well
+        sa.Index(
+            'uq_cart_user_id_product_id_active', 'user_id', 'product_id',
+            unique=True, postgresql_where=sa.text('status')
+        ),
+    )
+
     user_id: Mapped[int] = mapped_column(sa.ForeignKey("user.user_id", ondelete="CASCADE"))
     product_id: Mapped[int] = mapped_column(sa.ForeignKey("product.id", ondelete="CASCADE"))
     total_count: Mapped[int] = mapped_column(
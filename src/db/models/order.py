@@ -5,6 +5,7 @@ import sqlalchemy as sa
 import sqlalchemy.orm as orm
 from sqlalchemy.orm import Mapped, mapped_column
 
+from src.bot.structures.order_status import OrderStatus
 from src.bot.structures.role import Role
 
 from .base import Base
@@ -14,17 +15,33 @@ from ...language.enums import Locales
 class Order(Base):
     """Order model."""
 
+    __table_args__ = (
+        # Order history pages of a user are read by id
+        sa.Index('ix_order_user_id_id', 'user_id', 'id'),
+        # Statistics and reports sum up a period of orders from the index alone
+        sa.Index('ix_order_created_at', 'created_at', postgresql_include=['total_price', 'region', 'district']),
+    )
+
     user_id: Mapped[int] = mapped_column(sa.ForeignKey("user.user_id", ondelete="CASCADE"))
 
     total_price: Mapped[int] = mapped_column(
         sa.Numeric, unique=False, nullable=True
     )
-    status: Mapped[bool] = mapped_column(
-        sa.Boolean, default=True
+    status: Mapped[OrderStatus] = mapped_column(
+        sa.Enum(OrderStatus), default=OrderStatus.PENDING
+    )
+    courier_id: Mapped[int] = mapped_column(
+        sa.BigInteger, unique=False, nullable=True
     )
     lat_long: Mapped[str] = mapped_column(
         sa.String(100), unique=False, nullable=True
     )
+    region: Mapped[str] = mapped_column(
+        sa.String(100), unique=False, nullable=True
+    )
+    district: Mapped[str] = mapped_column(
+        sa.String(100), unique=False, nullable=True
+    )
     created_at: Mapped[Optional[Annotated[datetime.datetime, mapped_column(nullable=False, default=datetime.datetime.utcnow)]]]
 
     def __str__(self):
@@ -0,0 +1,39 @@
+"""Order item model file."""
+import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class OrderItem(Base):
+    """Product line of an order with the price it was sold for."""
+
+    __tablename__ = 'order_item'
+    __table_args__ = (
+        sa.Index('ix_order_item_order_id', 'order_id'),
+        # Sales of a product are summed without reading the heap
+        sa.Index('ix_order_item_product_id', 'product_id', postgresql_include=['count', 'unit_price']),
+        # Sales of a period are summed without joining orders
+        sa.Index('ix_order_item_created_at', 'created_at', postgresql_include=['product_id', 'count', 'unit_price']),
+    )
+
+    order_id: Mapped[int] = mapped_column(sa.ForeignKey("order.id", ondelete="CASCADE"))
+    # Sales history outlives a deleted product
+    product_id: Mapped[int] = mapped_column(
+        sa.ForeignKey("product.id", ondelete="SET NULL"), nullable=True
+    )
+    count: Mapped[int] = mapped_column(
+        sa.Integer, unique=False, nullable=False
+    )
+    unit_price: Mapped[int] = mapped_column(
+        sa.Numeric, unique=False, nullable=False
+    )
+    # Copy of the order's creation time
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        sa.DateTime, unique=False, nullable=False
+    )
+
+    def __str__(self):
+        return f"{self.count} x {self.unit_price}"
@@ -15,6 +15,14 @@ from ...language.enums import Locales
 class Product(Base):
     """Product model."""
 
+    __table_args__ = (
+        # Search by a part of the name or a similar name, needs pg_trgm
+        sa.Index(
+            'ix_product_product_name_trgm', 'product_name',
+            postgresql_using='gin', postgresql_ops={'product_name': 'gin_trgm_ops'},
+        ),
+    )
+
     product_name: Mapped[str] = mapped_column(
         sa.Text, unique=False, nullable=True
     )
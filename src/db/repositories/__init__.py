@@ -2,7 +2,8 @@
 from .user import UserRepo
 from .product import ProductRepo
 from .order import OrderRepo
+from .order_item import OrderItemRepo
 from .cart import CartRepo
 
 
-__all__ = ( 'UserRepo', 'ProductRepo', 'OrderRepo', 'CartRepo')
+__all__ = ( 'UserRepo', 'ProductRepo', 'OrderRepo', 'OrderItemRepo', 'CartRepo')
@@ -1,14 +1,73 @@
 """Repository file."""
 import abc
-from typing import Generic, TypeVar
-from collections.abc import Sequence
+import asyncio
+import contextlib
+import copy
+import functools
+import weakref
+from typing import Any, Generic, TypeVar
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
 
 from sqlalchemy import delete, select, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import Cache
+from src.cache.singleflight import SingleFlight
+from src.configuration import conf
+
 from ..models import Base
 
 AbstractModel = TypeVar('AbstractModel')
+T = TypeVar('T')
+
+
+class SharedSessions:
+    """Sessions for loads shared by concurrent callers.
+
+    At most ``limit`` of them are open at once per engine, so shared loads
+    take a bounded number of connections on top of the handlers' own.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @contextlib.asynccontextmanager
+    async def open(self, bind) -> AsyncIterator[AsyncSession]:
+        """Open a session once one of the engine's slots is free."""
+        semaphore = self.semaphores.get(bind)
+        if semaphore is None:
+            semaphore = self.semaphores[bind] = asyncio.Semaphore(self.limit)
+        async with semaphore, AsyncSession(bind=bind) as session:
+            yield session
+
+
+shared_sessions = SharedSessions(conf.db.shared_sessions)
+
+
+def coalesce(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """Make concurrent identical reads share one query.
+
+    Calls are identical when the method and its arguments are equal, so the
+    arguments have to be hashable. The query runs on ``Repository.shared``,
+    so the first caller going away can't close it under the others. Use it
+    only for reads of columns, NamedTuples or scalars: ORM entities would be
+    detached from every caller's session. Every caller gets its own copy of
+    a returned list.
+    """
+    flights = SingleFlight()
+
+    @functools.wraps(func)
+    async def wrapper(self, *args: Any, **kwargs: Any) -> T:
+        async def load() -> T:
+            async with self.shared() as repository:
+                return await func(repository, *args, **kwargs)
+
+        key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+        result = await flights.do(key, load)
+        return list(result) if isinstance(result, list) else result
+
+    return wrapper
 
 
 class Repository(Generic[AbstractModel]):
@@ -16,15 +75,32 @@ class Repository(Generic[AbstractModel]):
 
     type_model: type[Base]
     session: AsyncSession
+    cache: Cache | None
 
-    def __init__(self, type_model: type[Base], session: AsyncSession):
+    def __init__(
+        self, type_model: type[Base], session: AsyncSession, cache: Cache | None = None
+    ):
         """Initialize abstract repository class.
 
         :param type_model: Which model will be used for operations
-        :param session: Session in which repository will work.
+        :param session: Session in which repository will work
+        :param cache: (Optional) Cache for methods decorated with `cached`.
         """
         self.type_model = type_model
         self.session = session
+        self.cache = cache
+
+    @contextlib.asynccontextmanager
+    async def shared(self) -> AsyncIterator['Repository']:
+        """Copy of the repository for a load shared by concurrent callers.
+
+        The copy works in a session from ``shared_sessions`` instead of the
+        caller's one, which may be closed before the load is done.
+        """
+        async with shared_sessions.open(self.session.bind) as session:
+            repository = copy.copy(self)
+            repository.session = session
+            yield repository
 
     async def get(self, ident: int | str) -> AbstractModel:
         """Get an ONE model from the database with PK.
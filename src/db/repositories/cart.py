@@ -1,8 +1,11 @@
 """User repository file."""
 
-from sqlalchemy import select, update, delete
+from sqlalchemy import and_, select, text, update, delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import Cache
+
 from src.bot.structures.role import Role
 
 from ..models import Base, Cart
@@ -10,10 +13,15 @@ from .abstract import Repository
 
 
 class CartRepo(Repository[Cart]):
-    """Cart repository for CRUD and other SQL queries."""
+    """Cart repository for CRUD and other SQL queries.
+
+    The bot keeps live carts in Redis (see `src.cache.cart.CartStore`), this
+    repository only keeps the legacy cart table consistent for code which
+    still writes to it.
+    """
 
-    def __init__(self, session: AsyncSession):
-        super().__init__(type_model=Cart, session=session)
+    def __init__(self, session: AsyncSession, cache: Cache | None = None):
+        super().__init__(type_model=Cart, session=session, cache=cache)
 
     async def new(
         self,
@@ -22,14 +30,23 @@ class CartRepo(Repository[Cart]):
         total_price: int,
         total_count: int,
     ) -> None:
-        await self.session.merge(
-            Cart(
-                user_id=user_id,
-                product_id=product_id,
-                total_price=total_price,
-                total_count=total_count,
-            )
+        """Add product to the cart, adding the same product again sums it up."""
+        stmt = insert(Cart).values(
+            user_id=user_id,
+            product_id=product_id,
+            total_price=total_price,
+            total_count=total_count,
+            status=True,
         )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Cart.user_id, Cart.product_id],
+            index_where=text('status'),
+            set_=dict(
+                total_price=Cart.total_price + stmt.excluded.total_price,
+                total_count=Cart.total_count + stmt.excluded.total_count,
+            ),
+        )
+        await self.session.execute(stmt)
         await self.session.commit()
 
     async def get(self, id: int) -> Cart:
@@ -38,8 +55,9 @@ class CartRepo(Repository[Cart]):
         )
     
     async def get_cart_products(self, user_id: int):
+        """Get active cart lines of the user, served by the unique partial index."""
         result = await self.session.scalars(
-            select(Cart).where(Cart.user_id == user_id and Cart.status == True)
+            select(Cart).where(and_(Cart.user_id == user_id, Cart.status == True))
         )
 
         cart_products = result.all()
@@ -49,12 +67,25 @@ class CartRepo(Repository[Cart]):
         # async with self.session.begin():
         stmt = (
             update(Cart)
-            .where(Cart.user_id == user_id and Cart.id == cart_id)
+            .where(and_(Cart.user_id == user_id, Cart.id == cart_id))
             .values(**kwargs)
         )
         await self.session.execute(stmt)
         await self.session.commit()
 
+    async def pop_active(self, limit: int) -> list[tuple[int, int, int, int]]:
+        """Delete up to `limit` active cart lines and return them, the caller commits.
+
+        :return: Rows of user_id, product_id, total_count and total_price
+        """
+        lines = select(Cart.id).where(Cart.status == True).limit(limit).scalar_subquery()
+        result = await self.session.execute(
+            delete(Cart)
+            .where(Cart.id.in_(lines))
+            .returning(Cart.user_id, Cart.product_id, Cart.total_count, Cart.total_price)
+        )
+        return [tuple(row) for row in result]
+
     async def delete_cart(self, cart_id: int) -> None:
         await super().delete(Cart.id == cart_id)
 
@@ -1,36 +1,133 @@
 """User repository file."""
 
 from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Iterable, NamedTuple, Optional
 
-from sqlalchemy import select, and_
+from sqlalchemy import Integer, func, insert, select, update, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import Cache
+from src.cache.codec import RowsCodec
+from src.cache.decorators import cached
+
+from src.bot.structures.order_status import OrderStatus
 from src.bot.structures.role import Role
 
-from ..models import Base, Order
-from .abstract import Repository
+from ..models import Base, Order, OrderItem
+from .abstract import Repository, coalesce
+
+
+class OrderSummary(NamedTuple):
+    """Order as listed to its user, read without loading the entity."""
+
+    id: int
+    total_price: Decimal
+    created_at: datetime
+    lat_long: str
+
+
+class OrderLine(NamedTuple):
+    """Product line written with a new order."""
+
+    product_id: int
+    count: int
+    unit_price: int
+
+
+class DistrictSales(NamedTuple):
+    """Orders of one district over a period."""
+
+    region: Optional[str]
+    district: Optional[str]
+    orders: int
+    revenue: Decimal
+
+
+class HourSales(NamedTuple):
+    """Orders made in one hour of the day over a period."""
+
+    hour: int
+    orders: int
+    revenue: Decimal
+
+
+def day_bounds(date) -> tuple[datetime, datetime]:
+    """First and last moment of the day."""
+    start = datetime.combine(date, datetime.min.time())
+    end = datetime.combine(date, datetime.max.time())
+    return start, end
+
+
+def week_bounds(start_date) -> tuple[datetime, datetime]:
+    """First and last moment of the week starting on start_date."""
+    start = datetime.combine(start_date, datetime.min.time())
+    end = start + timedelta(days=6, hours=23, minutes=59, seconds=59)
+    return start, end
+
+
+def month_bounds(year, month) -> tuple[datetime, datetime]:
+    """First and last second of the month."""
+    start = datetime(year, month, 1)
+    if month == 12:
+        end = datetime(year + 1, 1, 1) - timedelta(seconds=1)
+    else:
+        end = datetime(year, month + 1, 1) - timedelta(seconds=1)
+    return start, end
 
 
 class OrderRepo(Repository[Order]):
     """Order repository for CRUD and other SQL queries."""
 
-    def __init__(self, session: AsyncSession):
-        super().__init__(type_model=Order, session=session)
+    def __init__(self, session: AsyncSession, cache: Cache | None = None):
+        super().__init__(type_model=Order, session=session, cache=cache)
 
     async def new(
         self,
         user_id: int,
         total_price: int,
-        lat_long: str
-    ) -> None:
-        await self.session.merge(
+        lat_long: str,
+        region: str | None = None,
+        district: str | None = None,
+        items: Iterable[OrderLine] = (),
+    ) -> int:
+        """Add an order with its product lines in one transaction.
+
+        :param region: (Optional) Region the order is delivered to
+        :param district: (Optional) District of the region
+        :param items: (Optional) Product lines, inserted with one statement
+        :return: Id of the order
+        """
+        order = await self.session.merge(
             Order(
                 user_id=user_id,
                 total_price=total_price,
-                lat_long=lat_long
+                lat_long=lat_long,
+                region=region,
+                district=district,
             )
         )
+        await self.session.flush()
+        order_id = order.id
+        rows = [dict(order_id=order_id, created_at=order.created_at, **item._asdict()) for item in items]
+        if rows:
+            await self.session.execute(insert(OrderItem).values(rows))
         await self.session.commit()
+        return order_id
+
+    async def claim(self, order_id: int, courier_id: int) -> int | None:
+        """Assign a pending order to the courier in one conditional update.
+
+        :return: Order id if this courier won the order, else None.
+        """
+        order_id = await self.session.scalar(
+            update(Order)
+            .where(Order.id == order_id, Order.status == OrderStatus.PENDING)
+            .values(status=OrderStatus.ACCEPTED, courier_id=courier_id)
+            .returning(Order.id)
+        )
+        await self.session.commit()
+        return order_id
 
     async def get_all_by_user_id(self, user_id: int):
         result = await self.session.scalars(
@@ -38,7 +135,41 @@ class OrderRepo(Repository[Order]):
         )
         orders = result.all()
         return orders
-        
+
+    async def get_summaries_by_user_id(
+        self,
+        user_id: int,
+        limit: int | None = None,
+        before: int | None = None,
+        after: int | None = None,
+    ) -> list[OrderSummary]:
+        """Get a page of the user's orders, newest first, with only the listed columns.
+
+        Pages are keyed by order id, so a page costs the same however deep it
+        is.
+
+        :param user_id: Telegram user id
+        :param limit: (Optional) Page size
+        :param before: (Optional) Page of orders older than this id
+        :param after: (Optional) Page of orders newer than this id
+        """
+        statement = (
+            select(Order.id, Order.total_price, Order.created_at, Order.lat_long)
+            .where(Order.user_id == user_id)
+            .limit(limit)
+        )
+        if after is not None:
+            statement = statement.where(Order.id > after).order_by(Order.id)
+        else:
+            if before is not None:
+                statement = statement.where(Order.id < before)
+            statement = statement.order_by(Order.id.desc())
+
+        orders = [OrderSummary(*row) for row in await self.session.execute(statement)]
+        if after is not None:
+            orders.reverse()
+        return orders
+
     async def get_order(self, **filters):
         product = await self.session.scalar(
             select(Order).filter_by(**filters).limit(1)
@@ -51,23 +182,66 @@ class OrderRepo(Repository[Order]):
         )
         return result.scalars().all()
 
-    async def get_orders_by_day(self, date):
-        start = datetime.combine(date, datetime.min.time())
-        end = datetime.combine(date, datetime.max.time())
+    async def get_orders_between(self, start: datetime, end: datetime):
+        """Get orders created between start and end inclusive."""
         filters = and_(Order.created_at >= start, Order.created_at <= end)
         return await self.get_orders(filters)
 
+    async def get_orders_by_day(self, date):
+        return await self.get_orders_between(*day_bounds(date))
+
     async def get_orders_by_week(self, start_date):
-        start = datetime.combine(start_date, datetime.min.time())
-        end = start + timedelta(days=6, hours=23, minutes=59, seconds=59)
-        filters = and_(Order.created_at >= start, Order.created_at <= end)
-        return await self.get_orders(filters)
+        return await self.get_orders_between(*week_bounds(start_date))
 
     async def get_orders_by_month(self, year, month):
-        start = datetime(year, month, 1)
-        if month == 12:
-            end = datetime(year + 1, 1, 1) - timedelta(seconds=1)
-        else:
-            end = datetime(year, month + 1, 1) - timedelta(seconds=1)
-        filters = and_(Order.created_at >= start, Order.created_at <= end)
-        return await self.get_orders(filters)
+        return await self.get_orders_between(*month_bounds(year, month))
+
+    @coalesce
+    async def get_total_price_between(self, start: datetime, end: datetime) -> Decimal:
+        """Sum prices of orders created between start and end inclusive."""
+        return await self.session.scalar(
+            select(func.coalesce(func.sum(Order.total_price), 0))
+            .where(and_(Order.created_at >= start, Order.created_at <= end))
+        )
+
+    async def get_total_price_by_day(self, date) -> Decimal:
+        return await self.get_total_price_between(*day_bounds(date))
+
+    async def get_total_price_by_week(self, start_date) -> Decimal:
+        return await self.get_total_price_between(*week_bounds(start_date))
+
+    async def get_total_price_by_month(self, year, month) -> Decimal:
+        return await self.get_total_price_between(*month_bounds(year, month))
+
+    @cached(key='report:districts:{start:%Y%m%d%H}-{end:%Y%m%d%H}', codec=RowsCodec(DistrictSales))
+    async def get_sales_by_district(self, start: datetime, end: datetime) -> list[DistrictSales]:
+        """Count and sum orders created between start and end inclusive by district.
+
+        Orders made before districts were stored are under None.
+
+        :return: Sales, the highest revenue first
+        """
+        revenue = func.coalesce(func.sum(Order.total_price), 0)
+        statement = (
+            select(Order.region, Order.district, func.count(), revenue)
+            .where(and_(Order.created_at >= start, Order.created_at <= end))
+            .group_by(Order.region, Order.district)
+            .order_by(revenue.desc())
+        )
+        return [DistrictSales(*row) for row in await self.session.execute(statement)]
+
+    @cached(key='report:hours:{start:%Y%m%d%H}-{end:%Y%m%d%H}:{utc_offset}', codec=RowsCodec(HourSales))
+    async def get_sales_by_hour(self, start: datetime, end: datetime, utc_offset: int = 0) -> list[HourSales]:
+        """Count and sum orders created between start and end inclusive by hour of the day.
+
+        :param utc_offset: (Optional) Hours are of this time zone
+        :return: Sales of the hours which had orders, in order of hour
+        """
+        hour = func.extract('hour', Order.created_at + timedelta(hours=utc_offset)).cast(Integer)
+        statement = (
+            select(hour, func.count(), func.coalesce(func.sum(Order.total_price), 0))
+            .where(and_(Order.created_at >= start, Order.created_at <= end))
+            .group_by(hour)
+            .order_by(hour)
+        )
+        return [HourSales(*row) for row in await self.session.execute(statement)]
@@ -0,0 +1,48 @@
+"""Order item repository file."""
+from datetime import datetime
+from decimal import Decimal
+from typing import NamedTuple, Optional
+
+from sqlalchemy import func, select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import Cache
+from src.cache.codec import RowsCodec
+from src.cache.decorators import cached
+
+from ..models import OrderItem, Product
+from .abstract import Repository
+
+
+class ProductSales(NamedTuple):
+    """Sales of one product over a period."""
+
+    product_id: Optional[int]
+    product_name: Optional[str]
+    count: int
+    revenue: Decimal
+
+
+class OrderItemRepo(Repository[OrderItem]):
+    """Order item repository for sales queries."""
+
+    def __init__(self, session: AsyncSession, cache: Cache | None = None):
+        super().__init__(type_model=OrderItem, session=session, cache=cache)
+
+    @cached(key='report:products:{start:%Y%m%d%H}-{end:%Y%m%d%H}', codec=RowsCodec(ProductSales))
+    async def get_product_sales(self, start: datetime, end: datetime) -> list[ProductSales]:
+        """Sold count and revenue of every product in orders created between start and end inclusive.
+
+        Lines of deleted products are summed up under a None id.
+
+        :return: Sales, the highest revenue first
+        """
+        revenue = func.sum(OrderItem.count * OrderItem.unit_price)
+        statement = (
+            select(OrderItem.product_id, Product.product_name, func.sum(OrderItem.count), revenue)
+            .outerjoin(Product, Product.id == OrderItem.product_id)
+            .where(and_(OrderItem.created_at >= start, OrderItem.created_at <= end))
+            .group_by(OrderItem.product_id, Product.product_name)
+            .order_by(revenue.desc())
+        )
+        return [ProductSales(*row) for row in await self.session.execute(statement)]
@@ -1,19 +1,34 @@
 """User repository file."""
+from typing import NamedTuple
 
-from sqlalchemy import select
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import Cache
+from src.cache.codec import ModelCodec
+from src.cache.decorators import cached
+from src.cache.namespace import CATALOG
+from src.configuration import conf
+from src.language.enums import Locales
+
 from src.bot.structures.role import Role
 
 from ..models import Base, Product
-from .abstract import Repository
+from .abstract import Repository, coalesce
+
+
+class ProductItem(NamedTuple):
+    """Product as a menu button, read without loading the entity."""
+
+    product_name: str
+    id: int
 
 
 class ProductRepo(Repository[Product]):
     """Product repository for CRUD and other SQL queries."""
 
-    def __init__(self, session: AsyncSession):
-        super().__init__(type_model=Product, session=session)
+    def __init__(self, session: AsyncSession, cache: Cache | None = None):
+        super().__init__(type_model=Product, session=session, cache=cache)
 
     async def new(
         self,
@@ -29,6 +44,12 @@ class ProductRepo(Repository[Product]):
             )
         )
         await self.session.commit()
+        await self.invalidate_catalog()
+
+    @cached(key='product:{ident}', codec=ModelCodec(Product))
+    async def get(self, ident: int) -> Product:
+        """Get product by id, cached until it is deleted."""
+        return await super().get(ident)
 
     async def get_product(self, **filters):
         product = await self.session.scalar(
@@ -44,7 +65,49 @@ class ProductRepo(Repository[Product]):
 
         products = result.all()
         return products
-    
+
+    @coalesce
+    async def get_product_items(self, offset: int = 0, limit: int | None = None) -> list[ProductItem]:
+        """Get names and ids of products in the order they were added."""
+        result = await self.session.execute(
+            select(Product.product_name, Product.id)
+            .order_by(Product.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        return [ProductItem(*row) for row in result]
+
+    async def search(self, query: str, limit: int) -> list[ProductItem]:
+        """Find products by a part of the name or a similar name, best matches first.
+
+        Both conditions are served by the trigram index on product names.
+        """
+        result = await self.session.execute(
+            select(Product.product_name, Product.id)
+            .where(or_(
+                Product.product_name.icontains(query, autoescape=True),
+                Product.product_name.op('%')(query),
+            ))
+            .order_by(func.similarity(Product.product_name, query).desc(), Product.id)
+            .limit(limit)
+        )
+        return [ProductItem(*row) for row in result]
+
+    async def count(self) -> int:
+        """Count all products."""
+        return await self.session.scalar(select(func.count()).select_from(Product))
+
+    async def invalidate_catalog(self) -> None:
+        """Drop cached product keyboard pages, pages after the last one may be cached too."""
+        if self.cache is None:
+            return
+        pages = await self.count() // conf.bot.products_page_size + 2
+        await self.cache.delete(*(
+            CATALOG.key(locale.name, page) for locale in Locales for page in range(pages)
+        ))
+
     async def delete(self, product_id: int):
         await super().delete(Product.id == product_id)
         await self.session.commit()
+        await ProductRepo.get.invalidate(self, product_id)
+        await self.invalidate_catalog()
@@ -1,8 +1,12 @@
 """User repository file."""
 
-from sqlalchemy import select, update
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import Cache
+from src.cache.codec import ModelCodec
+from src.cache.decorators import cached
+
 from src.bot.structures.role import Role
 
 from ..models import Base, User
@@ -12,9 +16,9 @@ from .abstract import Repository
 class UserRepo(Repository[User]):
     """User repository for CRUD and other SQL queries."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, cache: Cache | None = None):
         """Initialize user repository as for all users or only for one user."""
-        super().__init__(type_model=User, session=session)
+        super().__init__(type_model=User, session=session, cache=cache)
 
     async def new(
         self,
@@ -48,9 +52,11 @@ class UserRepo(Repository[User]):
             )
         )
         await self.session.commit()
+        await UserRepo.get_me.invalidate(self, user_id)
 
+    @cached(key='user:{user_id}', codec=ModelCodec(User))
     async def get_me(self, user_id: int) -> User:
-        """Get user role by id."""
+        """Get user by id, cached for a short time."""
         user = await self.session.scalar(
             select(User).where(User.user_id == user_id).limit(1)
         )
@@ -66,3 +72,8 @@ class UserRepo(Repository[User]):
         )
         await self.session.execute(stmt)
         await self.session.commit()
+        await UserRepo.get_me.invalidate(self, user_id)
+
+    async def count(self) -> int:
+        """Count all users."""
+        return await self.session.scalar(select(func.count()).select_from(User))
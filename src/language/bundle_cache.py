@@ -0,0 +1,146 @@
+""" This file contains the disk cache of compiled Fluent bundles
+
+Parsing and compiling .ftl files with fluent_compiler takes most of the
+translator's start-up time. Code objects of a compiled bundle are stored with
+marshal under a key made of the files' content hash, the locale and the
+interpreter and compiler versions, so a process only compiles files which
+changed since the cache was built. The versions are stored in the file as well
+and checked on load. The cache relies on internals of fluent_compiler, so any
+mismatch or error falls back to a normal compile.
+
+Build the cache ahead of time with ``python -m src.language.bundle_cache``.
+"""
+import hashlib
+import logging
+import marshal
+import os
+import sys
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import babel
+from fluent_compiler.builtins import BUILTINS
+from fluent_compiler.bundle import FluentBundle
+from fluent_compiler.compiler import compile_messages, messages_to_module
+from fluent_compiler.resource import FtlResource
+
+LOCALES_PATH = Path(__file__).parent / "locales"
+CACHE_DIR = LOCALES_PATH / "__ftlcache__"
+
+BUNDLES: Dict[str, Tuple[str, List[Path]]] = {
+    "ru": ("ru-RU", [LOCALES_PATH / "ru.ftl"]),
+    "uz": ("uz-UZ", [LOCALES_PATH / "uz.ftl"]),
+}
+""" Fluent bundle locale and source files of every translator locale """
+
+logger = logging.getLogger(__name__)
+
+
+class StaleBundleError(ValueError):
+    """Compiled bundle was made by another interpreter or compiler"""
+
+
+class CachedFluentBundle(FluentBundle):
+    """FluentBundle made of already compiled message functions"""
+
+    def __init__(self, locale: str, message_functions: Dict[str, Callable], errors: Sequence = ()):
+        self.locale = locale
+        self._compiled_messages = message_functions
+        self._compilation_errors = list(errors)
+
+
+def compiler_version() -> str:
+    """Interpreter and fluent_compiler versions the compiled code depends on"""
+    return f"{sys.implementation.cache_tag}:{version('fluent_compiler')}"
+
+
+def cache_key(locale: str, filenames: Iterable[Path]) -> str:
+    """
+    Key of a compiled bundle
+    :param locale: Bundle locale
+    :param filenames: Source .ftl files
+    :return: Hex digest
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{locale}:{compiler_version()}".encode())
+    for filename in filenames:
+        digest.update(Path(filename).read_bytes())
+    return digest.hexdigest()[:32]
+
+
+def load_bundle(
+    locale: str, filenames: Sequence[Path], cache_dir: Optional[Path] = CACHE_DIR
+) -> FluentBundle:
+    """
+    Load a bundle from the cache, compile and cache it on a miss
+    :param locale: Bundle locale, e.g. "uz-UZ"
+    :param filenames: Source .ftl files
+    :param cache_dir: (Optional) Cache directory, None disables the cache
+    :return: Bundle
+    """
+    if cache_dir is None:
+        return FluentBundle.from_files(locale, filenames)
+
+    path = cache_dir / f"{locale}-{cache_key(locale, filenames)}.marshal"
+    try:
+        return _load(locale, path.read_bytes())
+    except FileNotFoundError:
+        pass
+    except StaleBundleError:
+        logger.warning("Compiled bundle %s is stale, compiling again", path)
+    except Exception:
+        logger.warning("Compiled bundle %s is broken, compiling again", path, exc_info=True)
+
+    try:
+        compiled = compile_messages(locale, [FtlResource.from_file(f) for f in filenames])
+    except Exception:
+        logger.warning("Bundle %s can't be compiled for the cache", locale, exc_info=True)
+        return FluentBundle.from_files(locale, filenames)
+
+    bundle = CachedFluentBundle(locale, compiled.message_functions, compiled.errors)
+    if not compiled.errors:
+        # Bundles with errors are compiled every time, so the errors stay visible
+        try:
+            _store(path, compiled)
+        except Exception:
+            logger.warning("Bundle %s can't be stored in the cache", locale, exc_info=True)
+    return bundle
+
+
+def _load(locale: str, data: bytes) -> FluentBundle:
+    payload: Dict[str, Any] = marshal.loads(data)
+    if payload.get("compiler") != compiler_version():
+        raise StaleBundleError(payload.get("compiler"))
+    # Globals are the runtime helpers only, building them compiles no messages
+    _, _, module_globals, _ = messages_to_module(
+        {}, babel.Locale.parse(locale.replace("-", "_")), functions=BUILTINS.copy()
+    )
+    exec(payload["code"], module_globals)
+    return CachedFluentBundle(
+        locale, {key: module_globals[name] for key, name in payload["mapping"].items()}
+    )
+
+
+def _store(path: Path, compiled: Any) -> None:
+    code = compile(compiled.module_ast, f"<ftl {compiled.locale}>", "exec")
+    # Message functions are module level functions, so their names are the
+    # names of module globals
+    mapping = {key: function.__name__ for key, function in compiled.message_functions.items()}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for stale in path.parent.glob(f"{compiled.locale}-*.marshal"):
+            stale.unlink()
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(marshal.dumps({"compiler": compiler_version(), "code": code, "mapping": mapping}))
+        os.replace(tmp, path)
+    except OSError:
+        # Read-only image, the bundle is compiled on every start
+        logger.warning("Compiled bundle cache %s is not writable", path.parent)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for bundle_locale, bundle_files in BUNDLES.values():
+        load_bundle(bundle_locale, bundle_files)
+        logger.info("Compiled %s", bundle_locale)
@@ -1,14 +1,23 @@
 """ This file contains a translator adapter """
-from pathlib import Path
-from typing import NamedTuple
+from typing import Dict, NamedTuple, Optional
 
-from fluent_compiler.bundle import FluentBundle
 from fluentogram import FluentTranslator, TranslatorHub, TranslatorRunner
 
 from src.configuration import conf
+from src.language.bundle_cache import BUNDLES, load_bundle
 from src.language.enums import Locales
 
-LOCALES_PATH = Path(__file__).parent / "locales"
+LOCALE_BY_LANGUAGE: Dict[str, str] = {
+    Locales.LATIN.name: "uz",
+    Locales.CYRILLIC.name: "ru",
+}
+""" Fluent locale of the language names kept in the cache """
+
+LOCALES_MAP: Dict[str, tuple] = {
+    "uz": ("uz",),
+    "ru": ("ru", "uz",),
+}
+""" Locales with their fallback chains """
 
 
 class Translator:
@@ -16,37 +25,30 @@ class Translator:
 
     translator_runner: TranslatorRunner
     translator_hub: TranslatorHub
+    translators: Dict[str, "LocalizedTranslator"]
 
     language: str
 
     def __init__(self):
         self.translator_hub = TranslatorHub(
             root_locale="uz",
-            locales_map={
-                "uz": ("uz",),
-                "ru": ("ru", "uz",),
-            },
+            locales_map=LOCALES_MAP,
             translators=[
                 FluentTranslator(
-                    locale="ru",
-                    translator=FluentBundle.from_files(
-                        locale="ru-RU",
-                        filenames=[
-                            LOCALES_PATH / "ru.ftl",
-                        ],
-                    ),
-                ),
-                FluentTranslator(
-                    locale="uz",
-                    translator=FluentBundle.from_files(
-                        locale="uz-UZ",
-                        filenames=[
-                            LOCALES_PATH / "uz.ftl",
-                        ],
-                    ),
-                ),
+                    locale=locale,
+                    translator=load_bundle(bundle_locale, filenames),
+                )
+                for locale, (bundle_locale, filenames) in BUNDLES.items()
             ],
         )
+        # LocalizedTranslator only uses the runner's stateless `get`, so one
+        # instance per locale is shared by all updates
+        self.translators = {
+            locale: LocalizedTranslator(
+                translator=self.translator_hub.get_translator_by_locale(locale=locale)
+            )
+            for locale in LOCALES_MAP
+        }
 
     def get_text(self, key: str, language: Locales = conf.default_locale):
         """Get text from locale with key"""
@@ -55,19 +57,18 @@ class Translator:
             locale=language #or self.language
         ).get(key)
 
-    def __call__(self, language: str, *args, **kwargs):
-        """When instance calles it's produces LocalizedTranslator"""
+    def __call__(self, language: Optional[str], *args, **kwargs) -> "LocalizedTranslator":
+        """When instance calles it's returns LocalizedTranslator of the locale,
+        unknown locales get the default one"""
 
-        return LocalizedTranslator(
-            translator=self.translator_hub.get_translator_by_locale(
-                locale=language #or self.language
-            )
-        )
+        return self.translators.get(language) or self.translators[conf.translate.default_locale]
 
 
 class LocalizedTranslator:
     """This class produced by Translator"""
 
+    __slots__ = ("translator",)
+
     translator: TranslatorRunner
 
     def __init__(self, translator: TranslatorRunner):
@@ -0,0 +1,74 @@
+"""Bytes per key and encode/decode cost of cache codecs.
+
+Run with ``python -m tests.benchmarks.codecs``.
+"""
+import datetime
+import json
+import timeit
+
+from src.bot.structures.role import Role
+from src.cache.codec import JsonCodec, ModelCodec, MsgpackCodec, fsm_codec
+from src.db.models import Product, User
+from src.language.enums import Locales
+
+NUMBER = 20_000
+
+FSM_PAYLOADS = {
+    'order': {'product_id': '12', 'product_price': 15000},
+    'checkout': {'region': 'Farg‘ona', 'district': 'Marg‘ilon'},
+    'registration': {'language': 'CYRILLIC', 'fullname': 'Abdulla Qodiriy'},
+}
+
+USER = User(
+    id=1,
+    user_id=6012345678,
+    user_name='abdulla',
+    full_name='Abdulla Qodiriy',
+    phone_number='+998901234567',
+    language_code=Locales.CYRILLIC,
+    is_blocked=False,
+    is_premium=False,
+    role=Role.USER,
+    created_at=datetime.datetime(2024, 12, 14, 18, 9, 13, 152481),
+)
+PRODUCT = Product(
+    id=12,
+    product_name='Ruqiya suvi 19L',
+    price=15000,
+    created_at=datetime.datetime(2024, 12, 14, 18, 9, 13, 152481),
+)
+
+
+class AiogramJsonCodec(JsonCodec):
+    """What RedisStorage stores by default."""
+
+    def encode(self, value):
+        return json.dumps(value).encode()
+
+
+def measure(codec, value) -> tuple[int, float, float]:
+    """Size in bytes, encode and decode time in microseconds."""
+    data = codec.encode(value)
+    encode = timeit.timeit(lambda: codec.encode(value), number=NUMBER)
+    decode = timeit.timeit(lambda: codec.decode(data), number=NUMBER)
+    return len(data), encode / NUMBER * 1e6, decode / NUMBER * 1e6
+
+
+def main():
+    """Print results table."""
+    cases = []
+    for name, payload in FSM_PAYLOADS.items():
+        cases.append((f'fsm:{name}', 'json', AiogramJsonCodec(), payload))
+        cases.append((f'fsm:{name}', 'schema', fsm_codec, payload))
+    for name, entity in (('user', USER), ('product', PRODUCT)):
+        cases.append((f'model:{name}', 'json', ModelCodec(type(entity), JsonCodec()), entity))
+        cases.append((f'model:{name}', 'msgpack', ModelCodec(type(entity), MsgpackCodec()), entity))
+
+    print(f"{'value':<20}{'codec':<10}{'bytes':>8}{'encode, us':>14}{'decode, us':>14}")
+    for value, codec_name, codec, payload in cases:
+        size, encode, decode = measure(codec, payload)
+        print(f'{value:<20}{codec_name:<10}{size:>8}{encode:>14.2f}{decode:>14.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""Bulk-load synthetic users, products, carts, orders and their items into Postgres.
+
+Run with ``python -m tests.benchmarks.datagen [--users 1000000] [--orders 10000000]``.
+
+Rows are sent with COPY in chunks, so millions of rows load in minutes. The
+schema has to be migrated first (``make migrate``), ``--truncate`` empties the
+tables before loading. Point ``--database-url`` to a scratch database.
+
+The data is shaped like production: most users order rarely and a few order a
+lot, a part of users have a cart and most carts are already ordered, orders
+spread over ``--days`` days and the pending ones are the newest.
+"""
+import argparse
+import asyncio
+import datetime
+import random
+import time
+from collections.abc import Iterator
+from decimal import Decimal
+from itertools import islice
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from src.bot.utils.messages import regions
+from src.configuration import conf
+
+FIRST_USER_ID = 1_000_000_000
+CHUNK = 100_000
+COURIERS = [8_000_000_000 + n for n in range(30)]
+PENDING_SHARE = 0.01
+CART_SHARE = 0.3
+ACTIVE_CART_SHARE = 0.2
+ORDER_SKEW = 1.5
+
+FIRST_NAMES = ['Abdulla', 'Aziz', 'Dilnoza', 'Gulnora', 'Jasur', 'Madina', 'Nodira', 'Otabek', 'Sardor', 'Zarina']
+LAST_NAMES = ['Qodiriy', 'Karimov', 'Yusupova', 'Rashidov', 'Tursunov', 'Aliyeva', 'Ismoilov', 'Nazarova']
+REGIONS = list(regions)
+
+USER_COLUMNS = (
+    'user_id', 'user_name', 'full_name', 'phone_number', 'language_code', 'is_blocked', 'is_premium', 'role',
+    'created_at',
+)
+PRODUCT_COLUMNS = ('product_name', 'price', 'min_count', 'created_at')
+CART_COLUMNS = ('user_id', 'product_id', 'total_count', 'total_price', 'status', 'created_at')
+ORDER_COLUMNS = (
+    'id', 'user_id', 'total_price', 'status', 'courier_id', 'lat_long', 'region', 'district', 'created_at',
+)
+ORDER_ITEM_COLUMNS = ('order_id', 'product_id', 'count', 'unit_price', 'created_at')
+
+
+def moment(rng: random.Random, start: datetime.datetime, days: int, day: int | None = None) -> datetime.datetime:
+    """Random time of the period, most orders are made in the daytime.
+
+    :param day: (Optional) Day of the period, random by default
+    """
+    day = start + datetime.timedelta(days=rng.randrange(days) if day is None else day)
+    hour = min(int(rng.triangular(6, 24, 15)), 23)
+    return day.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60))
+
+
+def frequent_user(rng: random.Random, users: int) -> int:
+    """Telegram id of a user, low ids are picked much more often."""
+    return FIRST_USER_ID + int(users * rng.random() ** ORDER_SKEW)
+
+
+def user_rows(rng: random.Random, users: int, start: datetime.datetime, days: int) -> Iterator[tuple]:
+    for n in range(users):
+        yield (
+            FIRST_USER_ID + n,
+            f'user{n}' if rng.random() < 0.7 else None,
+            f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            f'+99890{n % 10_000_000:07d}',
+            'LATIN' if rng.random() < 0.7 else 'CYRILLIC',
+            rng.random() < 0.02,
+            rng.random() < 0.05,
+            'USER',
+            moment(rng, start, days),
+        )
+
+
+def product_rows(products: int, start: datetime.datetime) -> Iterator[tuple]:
+    for n in range(products):
+        yield f'Ruqiya suvi {n + 1}L', Decimal(5_000 + n * 1_000), 1, start
+
+
+def cart_rows(
+    rng: random.Random, users: int, prices: dict[int, Decimal], start: datetime.datetime, days: int
+) -> Iterator[tuple]:
+    product_ids = list(prices)
+    for n in range(users):
+        if rng.random() >= CART_SHARE:
+            continue
+        status = rng.random() < ACTIVE_CART_SHARE
+        for product_id in rng.sample(product_ids, min(rng.randint(1, 3), len(product_ids))):
+            count = rng.randint(1, 5)
+            yield FIRST_USER_ID + n, product_id, count, prices[product_id] * count, status, moment(rng, start, days)
+
+
+def order_contents(
+    seed: int, order_id: int, day: int, prices: dict[int, Decimal], start: datetime.datetime, days: int
+) -> tuple[datetime.datetime, list[tuple]]:
+    """Creation time and product lines of the order, the same on every call."""
+    rng = random.Random(seed * 1_000_003 + order_id)
+    created_at = moment(rng, start, days, day=day)
+    lines = [
+        (product_id, rng.randint(1, 5), prices[product_id])
+        for product_id in rng.sample(list(prices), min(rng.randint(1, 3), len(prices)))
+    ]
+    return created_at, lines
+
+
+def order_days(first_id: int, orders: int, days: int) -> Iterator[tuple[int, int]]:
+    """Ids of the orders with their day, later orders get greater ids like they do with a sequence."""
+    for order_id in range(first_id, first_id + orders):
+        yield order_id, (order_id - first_id) * days // orders
+
+
+def order_rows(
+    rng: random.Random, seed: int, first_id: int, orders: int, users: int, prices: dict[int, Decimal],
+    start: datetime.datetime, days: int
+) -> Iterator[tuple]:
+    pending_from = start + datetime.timedelta(days=days * (1 - PENDING_SHARE))
+    for order_id, day in order_days(first_id, orders, days):
+        created_at, lines = order_contents(seed, order_id, day, prices, start, days)
+        pending = created_at >= pending_from
+        region = rng.choice(REGIONS)
+        yield (
+            order_id,
+            frequent_user(rng, users),
+            sum(count * unit_price for _, count, unit_price in lines),
+            'PENDING' if pending else 'ACCEPTED',
+            None if pending else rng.choice(COURIERS),
+            f'{rng.uniform(40.30, 40.45):.6f},{rng.uniform(71.70, 71.85):.6f}',
+            region,
+            rng.choice(regions[region]),
+            created_at,
+        )
+
+
+def order_item_rows(
+    seed: int, first_id: int, orders: int, prices: dict[int, Decimal], start: datetime.datetime, days: int
+) -> Iterator[tuple]:
+    for order_id, day in order_days(first_id, orders, days):
+        created_at, lines = order_contents(seed, order_id, day, prices, start, days)
+        for line in lines:
+            yield order_id, *line, created_at
+
+
+async def copy(connection: asyncpg.Connection, table: str, columns: tuple[str, ...], rows: Iterator[tuple]) -> int:
+    """Send rows with COPY in chunks.
+
+    :return: Count of rows.
+    """
+    count = 0
+    started = time.perf_counter()
+    while chunk := list(islice(rows, CHUNK)):
+        await connection.copy_records_to_table(table, records=chunk, columns=columns)
+        count += len(chunk)
+    print(f'{table:<12}{count:>12} rows{time.perf_counter() - started:>10.1f} s')
+    return count
+
+
+async def main(database_url: str, users: int, products: int, orders: int, days: int, seed: int, truncate: bool):
+    """Load every table and refresh planner statistics."""
+    rng = random.Random(seed)
+    start = datetime.datetime.combine(datetime.date.today(), datetime.time()) - datetime.timedelta(days=days)
+    url = make_url(database_url).set(drivername='postgresql')
+    connection = await asyncpg.connect(url.render_as_string(hide_password=False))
+    try:
+        async with connection.transaction():
+            if truncate:
+                await connection.execute('TRUNCATE order_item, "order", cart, "user", product RESTART IDENTITY CASCADE')
+            await copy(connection, 'user', USER_COLUMNS, user_rows(rng, users, start, days))
+            await copy(connection, 'product', PRODUCT_COLUMNS, product_rows(products, start))
+            prices = {
+                record['id']: record['price']
+                for record in await connection.fetch('SELECT id, price FROM product')
+            }
+            await copy(connection, 'cart', CART_COLUMNS, cart_rows(rng, users, prices, start, days))
+            # Ids are given, so the items can refer to their orders
+            first_id = await connection.fetchval('SELECT coalesce(max(id), 0) + 1 FROM "order"')
+            await copy(
+                connection, 'order', ORDER_COLUMNS, order_rows(rng, seed, first_id, orders, users, prices, start, days)
+            )
+            await copy(
+                connection, 'order_item', ORDER_ITEM_COLUMNS, order_item_rows(seed, first_id, orders, prices, start, days)
+            )
+            await connection.execute(
+                'SELECT setval(pg_get_serial_sequence(\'"order"\', \'id\'), max(id)) FROM "order"'
+            )
+        await connection.execute('ANALYZE "user", product, cart, "order", order_item')
+    finally:
+        await connection.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bulk-load synthetic rows into Postgres with COPY')
+    parser.add_argument('--users', type=int, default=1_000_000, help='count of users')
+    parser.add_argument('--products', type=int, default=20, help='count of products')
+    parser.add_argument('--orders', type=int, default=10_000_000, help='count of orders')
+    parser.add_argument('--days', type=int, default=365, help='days the rows are spread over')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--truncate', action='store_true', help='empty the tables first')
+    parser.add_argument('--database-url', default=conf.db.build_connection_str(), help='SQLAlchemy URL')
+    args = parser.parse_args()
+    asyncio.run(main(
+        args.database_url, args.users, args.products, args.orders, args.days, args.seed, args.truncate
+    ))
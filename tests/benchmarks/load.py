@@ -0,0 +1,274 @@
+"""Throughput of the dispatcher replaying synthetic user journeys.
+
+Run with ``python -m tests.benchmarks.load [--users 200] [--concurrency 20]``.
+
+Every user registers, browses and adds products to the cart, checks out and
+changes the language. Updates go through ``get_dispatcher()`` and requests to
+Telegram are answered by ``MockedSession``, so only the bot's own work is
+measured.
+
+Postgres and Redis from the configuration are used, point them to scratch
+instances: tables are created if missing and products are added. Use
+``--database-url`` for another Postgres, ``--fake-redis`` runs without a Redis
+server when fakeredis is installed.
+"""
+import argparse
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import Location, Update, User
+from redis.asyncio.client import Redis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.bot.dispatcher import get_dispatcher, get_redis_storage
+from src.bot.utils.messages import default_languages, regions
+from src.bot.utils.order_notifier import OrderNotifier
+from src.cache import Cache
+from src.cache.adapter import build_redis_client
+from src.configuration import conf
+from src.db import Base
+from src.db.database import create_async_engine
+from src.db.models import Product
+from src.language.translator import Translator
+
+from ..utils.mocked_bot import MockedBot
+from ..utils.updates import get_callback_query, get_chat, get_message, get_update
+
+FIRST_USER_ID = 7_000_000_000
+REGION = 'Farg‘ona'
+MIN_SUM = 10_000
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Probe:
+    """What happened while one update was processed."""
+
+    handler: str = 'unhandled'
+    latency: float = 0.0
+    db_calls: int = 0
+    redis_calls: int = 0
+    failed: bool = False
+
+
+probe_var: ContextVar[Probe | None] = ContextVar('probe', default=None)
+
+
+class HandlerProbeMiddleware(BaseMiddleware):
+    """Record which handler got the update."""
+
+    async def __call__(self, handler, event, data: dict[str, Any]) -> Any:
+        """Name the handler, menu buttons are named by the handler they lead to."""
+        probe = probe_var.get()
+        if probe is not None:
+            callback = (data.get('menu_callback') or data['handler']).callback
+            probe.handler = f'{callback.__name__}:{callback.__code__.co_firstlineno}'
+        return await handler(event, data)
+
+
+def count_db_calls(engine: AsyncEngine) -> None:
+    """Count statements sent by the engine."""
+
+    @event.listens_for(engine.sync_engine, 'before_cursor_execute')
+    def before_cursor_execute(*_):
+        probe = probe_var.get()
+        if probe is not None:
+            probe.db_calls += 1
+
+
+def count_redis_calls(redis: Redis) -> None:
+    """Count round-trips of the client, a pipeline is one round-trip."""
+    execute_command = redis.execute_command
+    pipeline = redis.pipeline
+
+    def count():
+        probe = probe_var.get()
+        if probe is not None:
+            probe.redis_calls += 1
+
+    async def counted_execute_command(*args, **options):
+        count()
+        return await execute_command(*args, **options)
+
+    def counted_pipeline(*args, **kwargs):
+        pipe = pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        async def counted_execute(*execute_args, **execute_kwargs):
+            count()
+            return await execute(*execute_args, **execute_kwargs)
+
+        pipe.execute = counted_execute
+        return pipe
+
+    redis.execute_command = counted_execute_command
+    redis.pipeline = counted_pipeline
+
+
+def journey(user_id: int, product_ids: list[int], rng: random.Random) -> Iterator[Update]:
+    """Updates sent by one user from /start to changing the language."""
+    user = User(id=user_id, is_bot=False, first_name=f'User {user_id}')
+    chat = get_chat(chat_id=user_id)
+    menu = default_languages['LATIN']
+
+    def send(text: str | None = None, **kwargs) -> Update:
+        return get_update(message=get_message(text, chat=chat, from_user=user, **kwargs))
+
+    def press(data: str) -> Update:
+        message = get_message('', chat=chat, from_user=user)
+        return get_update(callback_query=get_callback_query(data, from_user=user, message=message))
+
+    # Registration
+    yield send('/start')
+    yield press('lang_uz')
+    yield send(f'User {user_id}')
+    yield send('+998901234567')
+
+    # Browsing and adding to the cart
+    for _ in range(rng.randint(1, 3)):
+        yield send(menu['categories'])
+        yield press(str(rng.choice(product_ids)))
+        yield press('place_order')
+        yield send(str(rng.randint(1, 5)))
+
+    # Checkout
+    yield send(menu['cart'])
+    yield press('make_order')
+    yield press(REGION)
+    yield press(rng.choice(regions[REGION]))
+    yield send(location=Location(latitude=40.38, longitude=71.78))
+
+    # Settings
+    yield send(menu['settings'])
+    yield press('change_lang')
+    yield press('lang_ru')
+
+
+async def prepare(engine: AsyncEngine, cache: Cache, products: int) -> list[int]:
+    """Create tables, products and settings the journeys need.
+
+    :return: Product ids.
+    """
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    items = [
+        Product(product_name=f'Ruqiya suvi {n}L', price=15_000 + n * 1000) for n in range(products)
+    ]
+    async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+        session.add_all(items)
+        await session.commit()
+    await cache.set('min_sum', MIN_SUM)
+    return [product.id for product in items]
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return values[max(math.ceil(q / 100 * len(values)) - 1, 0)]
+
+
+def report(probes: list[Probe], elapsed: float) -> str:
+    """Render throughput and per handler latencies."""
+    by_handler: dict[str, list[Probe]] = defaultdict(list)
+    for probe in probes:
+        by_handler[probe.handler].append(probe)
+
+    failed = sum(probe.failed for probe in probes)
+    lines = [
+        f'{len(probes)} updates in {elapsed:.2f} s, {len(probes) / elapsed:.1f} updates/s, {failed} failed',
+        '',
+        f"{'handler':<32}{'count':>7}{'p50, ms':>9}{'p95, ms':>9}{'p99, ms':>9}"
+        f"{'db/upd':>8}{'redis/upd':>10}{'failed':>8}",
+    ]
+    for name, items in sorted(by_handler.items(), key=lambda item: -len(item[1])):
+        latencies = sorted(probe.latency * 1000 for probe in items)
+        lines.append(
+            f'{name:<32}{len(items):>7}'
+            f'{percentile(latencies, 50):>9.2f}{percentile(latencies, 95):>9.2f}{percentile(latencies, 99):>9.2f}'
+            f'{sum(p.db_calls for p in items) / len(items):>8.2f}'
+            f'{sum(p.redis_calls for p in items) / len(items):>10.2f}'
+            f'{sum(p.failed for p in items):>8}'
+        )
+    return '\n'.join(lines)
+
+
+async def main(users: int, concurrency: int, products: int, database_url: str, fake_redis: bool, seed: int):
+    """Replay the journeys and print the report."""
+    engine = create_async_engine(database_url)
+    if fake_redis:
+        from fakeredis.aioredis import FakeRedis
+
+        redis = FakeRedis()
+    else:
+        redis = build_redis_client()
+    cache = Cache(redis=redis)
+    product_ids = await prepare(engine, cache, products)
+
+    count_db_calls(engine)
+    count_redis_calls(redis)
+
+    dp = get_dispatcher(storage=get_redis_storage(redis=redis))
+    dp.message.middleware(HandlerProbeMiddleware())
+    dp.callback_query.middleware(HandlerProbeMiddleware())
+    bot = MockedBot()
+    data = dict(engine=engine, cache=cache, order_notifier=OrderNotifier(redis=redis), translator=Translator())
+
+    listener = asyncio.create_task(cache.listen_invalidations())
+    await asyncio.sleep(0.1)  # Let tracked keys be served locally as in production
+
+    probes: list[Probe] = []
+    rng = random.Random(seed)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def replay(user_id: int, updates: list[Update]):
+        async with semaphore:
+            for update in updates:
+                probe = Probe()
+                probe_var.set(probe)
+                started = time.perf_counter()
+                try:
+                    await dp.feed_update(bot, update, **data)
+                except Exception:
+                    probe.failed = True
+                    logger.exception('Update of user %s failed', user_id)
+                probe.latency = time.perf_counter() - started
+                probes.append(probe)
+                bot.session.requests.clear()
+
+    journeys = {
+        user_id: list(journey(user_id, product_ids, rng))
+        for user_id in range(FIRST_USER_ID, FIRST_USER_ID + users)
+    }
+    started = time.perf_counter()
+    await asyncio.gather(*(replay(user_id, updates) for user_id, updates in journeys.items()))
+    elapsed = time.perf_counter() - started
+
+    listener.cancel()
+    await asyncio.gather(listener, return_exceptions=True)
+    await engine.dispose()
+    print(report(probes, elapsed))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay synthetic user journeys through the dispatcher')
+    parser.add_argument('--users', type=int, default=200, help='count of users')
+    parser.add_argument('--concurrency', type=int, default=20, help='users served at the same time')
+    parser.add_argument('--products', type=int, default=10, help='products to create')
+    parser.add_argument('--database-url', default=conf.db.build_connection_str(), help='SQLAlchemy URL')
+    parser.add_argument('--fake-redis', action='store_true', help='use fakeredis instead of Redis')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of the journeys')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(main(
+        args.users, args.concurrency, args.products, args.database_url, args.fake_redis, args.seed
+    ))
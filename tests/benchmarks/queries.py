@@ -0,0 +1,175 @@
+"""Latency and query plans of repository methods on a loaded database.
+
+Run with ``python -m tests.benchmarks.queries [--runs 20] [--plans]``.
+
+Load data first with ``python -m tests.benchmarks.datagen``. Every method is
+called with the cache disabled, in a new session per call, and the median,
+p95 and minimum latency are reported. ``--plans`` also prints
+``EXPLAIN (ANALYZE, BUFFERS)`` of every statement the method sent, a write is
+explained in a transaction which is rolled back.
+"""
+import argparse
+import asyncio
+import datetime
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.configuration import conf
+from src.db.database import Database, create_async_engine
+from src.db.models import Cart, Order
+
+from .load import percentile
+
+
+@dataclass
+class Case:
+    """Repository call which is measured."""
+
+    name: str
+    call: Callable[[Database], Awaitable]
+    latencies: list[float] = field(default_factory=list)
+    rows: int = 0
+    statements: list[tuple[str, tuple]] = field(default_factory=list)
+
+
+async def pick_arguments(session: AsyncSession) -> dict:
+    """Pick the arguments of the calls from the loaded data.
+
+    The heaviest user has the most orders, the typical one the median count.
+    """
+    per_user = (
+        select(Order.user_id, func.count().label('orders'))
+        .group_by(Order.user_id)
+        .order_by(func.count().desc())
+        .subquery()
+    )
+    users = (await session.execute(select(per_user.c.user_id))).scalars().all()
+    cart_user = await session.scalar(select(Cart.user_id).where(Cart.status == True).limit(1))  # noqa: E712
+    latest = await session.scalar(select(func.max(Order.created_at)))
+    if not users or cart_user is None:
+        raise SystemExit('No orders or carts, load data with python -m tests.benchmarks.datagen')
+    return dict(
+        heavy_user=users[0],
+        typical_user=users[len(users) // 2],
+        cart_user=cart_user,
+        day=latest.date(),
+    )
+
+
+def build_cases(arguments: dict) -> list[Case]:
+    day: datetime.date = arguments['day']
+    report = (
+        datetime.datetime.combine(day - datetime.timedelta(days=conf.bot.report_days - 1), datetime.time.min),
+        datetime.datetime.combine(day, datetime.time.max),
+    )
+    return [
+        Case('UserRepo.get_me', lambda db: db.user.get_me(arguments['typical_user'])),
+        Case('CartRepo.get_cart_products', lambda db: db.cart.get_cart_products(arguments['cart_user'])),
+        Case('OrderRepo.get_all_by_user_id typical', lambda db: db.order.get_all_by_user_id(arguments['typical_user'])),
+        Case('OrderRepo.get_all_by_user_id heavy', lambda db: db.order.get_all_by_user_id(arguments['heavy_user'])),
+        Case(
+            'OrderRepo.get_summaries_by_user_id heavy',
+            lambda db: db.order.get_summaries_by_user_id(arguments['heavy_user']),
+        ),
+        Case(
+            'OrderRepo.get_summaries_by_user_id page',
+            lambda db: db.order.get_summaries_by_user_id(arguments['heavy_user'], limit=conf.bot.orders_page_size + 1),
+        ),
+        Case('OrderRepo.get_orders_by_day', lambda db: db.order.get_orders_by_day(day)),
+        Case('OrderRepo.get_orders_by_week', lambda db: db.order.get_orders_by_week(day - datetime.timedelta(days=6))),
+        Case('OrderRepo.get_orders_by_month', lambda db: db.order.get_orders_by_month(day.year, day.month)),
+        Case('OrderRepo.get_total_price_by_month', lambda db: db.order.get_total_price_by_month(day.year, day.month)),
+        Case('OrderRepo.get_sales_by_district', lambda db: db.order.get_sales_by_district(*report)),
+        Case('OrderRepo.get_sales_by_hour', lambda db: db.order.get_sales_by_hour(*report, conf.bot.utc_offset)),
+        Case('OrderItemRepo.get_product_sales', lambda db: db.order_item.get_product_sales(*report)),
+        Case('ProductRepo.get_all_products', lambda db: db.product.get_all_products()),
+        Case('ProductRepo.get_product_items', lambda db: db.product.get_product_items()),
+        Case(
+            'ProductRepo.get_product_items page',
+            lambda db: db.product.get_product_items(limit=conf.bot.products_page_size + 1),
+        ),
+        Case('ProductRepo.search', lambda db: db.product.search('suvi 1', limit=conf.bot.search_results)),
+        Case('UserRepo.count', lambda db: db.user.count()),
+    ]
+
+
+async def measure(engine: AsyncEngine, case: Case, runs: int) -> None:
+    """Call the method in new sessions, the first call warms up and is not counted."""
+    statements: list[tuple[str, tuple]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    for run in range(runs + 1):
+        statements.clear()
+        event.listen(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            async with AsyncSession(bind=engine, expire_on_commit=False) as session:
+                started = time.perf_counter()
+                result = await case.call(Database(session))
+                elapsed = time.perf_counter() - started
+        finally:
+            event.remove(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+        if run:
+            case.latencies.append(elapsed)
+
+    case.rows = len(result) if isinstance(result, (list, tuple)) else int(result is not None)
+    case.statements = list(statements)
+
+
+async def explain(engine: AsyncEngine, statement: str, parameters: tuple) -> str:
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            result = await connection.exec_driver_sql(f'EXPLAIN (ANALYZE, BUFFERS) {statement}', parameters)
+            return '\n'.join(row[0] for row in result)
+        finally:
+            await transaction.rollback()
+
+
+def report(cases: list[Case]) -> str:
+    lines = [f"{'method':<44}{'rows':>8}{'p50, ms':>10}{'p95, ms':>10}{'min, ms':>10}"]
+    for case in cases:
+        latencies = sorted(latency * 1000 for latency in case.latencies)
+        lines.append(
+            f'{case.name:<44}{case.rows:>8}{statistics.median(latencies):>10.2f}'
+            f'{percentile(latencies, 95):>10.2f}{latencies[0]:>10.2f}'
+        )
+    return '\n'.join(lines)
+
+
+async def main(database_url: str, runs: int, plans: bool, only: str | None):
+    """Measure every case and print the report."""
+    engine = create_async_engine(database_url)
+    try:
+        async with AsyncSession(bind=engine) as session:
+            cases = build_cases(await pick_arguments(session))
+        if only:
+            cases = [case for case in cases if only in case.name]
+
+        for case in cases:
+            await measure(engine, case, runs)
+        print(report(cases))
+
+        if plans:
+            for case in cases:
+                for statement, parameters in case.statements:
+                    print(f'\n-- {case.name}\n{statement}\n{parameters}\n')
+                    print(await explain(engine, statement, parameters))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time repository methods and explain their queries')
+    parser.add_argument('--runs', type=int, default=20, help='measured calls of every method')
+    parser.add_argument('--plans', action='store_true', help='print EXPLAIN (ANALYZE, BUFFERS) of the statements')
+    parser.add_argument('--only', help='measure methods whose name contains this text')
+    parser.add_argument('--database-url', default=conf.db.build_connection_str(), help='SQLAlchemy URL')
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.runs, args.plans, args.only))
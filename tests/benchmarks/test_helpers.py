@@ -0,0 +1,110 @@
+"""Cost of transliteration, keyboards and message formatting done on every update.
+
+Run with ``make benchmark``, save a baseline with ``make benchmark-save`` and
+compare to it with ``make benchmark-compare``.
+"""
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from src.bot.structures.keyboards import common
+from src.bot.utils.messages import (
+    default_languages, get_cart_text, get_my_orders_text, get_order_text, get_sales_report_text, introduction_template,
+    regions, translate_region
+)
+from src.bot.utils.transliterate import to_cyrillic, to_latin, transliterate
+from src.db.repositories.order import DistrictSales, HourSales, OrderSummary
+from src.db.repositories.order_item import ProductSales
+from src.db.repositories.product import ProductItem
+
+REGION = 'Farg‘ona'
+LANGUAGES = ('LATIN', 'CYRILLIC')
+
+CART = [
+    ('Ruqiya suvi 19L', 2, 30000),
+    ('Ruqiya suvi 10L', 3, 36000),
+    ('Ruqiya suvi 5L', 5, 35000),
+]
+PRODUCTS = [ProductItem(f'Ruqiya suvi {n}L', n) for n in (1, 5, 10, 19, 20)]
+
+ORDERS = [
+    OrderSummary(n, Decimal(15000 * n), datetime.datetime(2024, 12, 14, 18, 9, 13, 152481), '40.38,71.78')
+    for n in range(1, 11)
+]
+
+PRODUCT_SALES = [
+    ProductSales(n, f'Ruqiya suvi {n}L', 100 * n, Decimal(500_000 * n)) for n in range(20, 0, -1)
+]
+DISTRICT_SALES = [
+    DistrictSales(region, district, 40, Decimal(600_000)) for region in regions for district in regions[region]
+]
+HOUR_SALES = [HourSales(hour, hour * 10, Decimal(150_000 * hour)) for hour in range(6, 24)]
+
+LATIN_TEXT = introduction_template['LATIN'] + default_languages['LATIN']['send_location_order']
+CYRILLIC_TEXT = introduction_template['CYRILLIC'] + default_languages['CYRILLIC']['send_location_order']
+
+KEYBOARDS = {
+    'get_languages': lambda lang: common.get_languages(),
+    'get_main_menu': common.get_main_menu,
+    'get_admin_menu': common.get_admin_menu,
+    'get_phone_number': common.get_phone_number,
+    'get_location': common.get_location,
+    'show_products': lambda lang: common.show_products(PRODUCTS, lang, page=1, has_next=True),
+    'make_order_or_back': common.make_order_or_back,
+    'show_regions': common.show_regions,
+    'show_distincts': lambda lang: common.show_distincts(REGION, lang),
+    'show_settings': common.show_settings,
+    'get_order': lambda lang: common.get_order(42),
+    'make_order': common.make_order,
+    'orders_pages': lambda lang: common.orders_pages(lang, newer=42, older=37),
+}
+
+
+def test_to_cyrillic(benchmark):
+    benchmark(to_cyrillic, LATIN_TEXT)
+
+
+def test_to_latin(benchmark):
+    benchmark(to_latin, CYRILLIC_TEXT)
+
+
+@pytest.mark.parametrize('lang', LANGUAGES)
+def test_transliterate(benchmark, lang):
+    benchmark(transliterate, LATIN_TEXT, lang)
+
+
+@pytest.mark.parametrize('lang', LANGUAGES)
+def test_translate_region(benchmark, lang):
+    names = [REGION, *regions[REGION]]
+
+    def translate():
+        return [translate_region(name, lang) for name in names]
+
+    benchmark(translate)
+
+
+@pytest.mark.parametrize('name', KEYBOARDS)
+@pytest.mark.parametrize('lang', LANGUAGES)
+def test_keyboard(benchmark, name, lang):
+    benchmark(KEYBOARDS[name], lang)
+
+
+@pytest.mark.parametrize('lang', LANGUAGES)
+def test_cart_text(benchmark, lang):
+    benchmark(get_cart_text, CART, lang)
+
+
+def test_order_text(benchmark):
+    benchmark(
+        get_order_text, 'Abdulla Qodiriy', '+998901234567', '40.38,71.78', REGION, 'Marg‘ilon', CART
+    )
+
+
+@pytest.mark.parametrize('lang', LANGUAGES)
+def test_my_orders_text(benchmark, lang):
+    benchmark(get_my_orders_text, ORDERS, lang)
+
+
+def test_sales_report_text(benchmark):
+    benchmark(get_sales_report_text, PRODUCT_SALES, DISTRICT_SALES, HOUR_SALES, days=30, top=5)
@@ -0,0 +1,38 @@
+"""Start-up cost of the Fluent bundles with and without the compiled cache.
+
+Run with ``python -m tests.benchmarks.translator``.
+"""
+import tempfile
+import timeit
+from pathlib import Path
+
+from src.language.bundle_cache import BUNDLES, load_bundle
+
+NUMBER = 20
+
+
+def measure(cache_dir: Path | None) -> float:
+    """Milliseconds to load every bundle once."""
+    def load():
+        for locale, filenames in BUNDLES.values():
+            load_bundle(locale, filenames, cache_dir=cache_dir)
+
+    load()  # Fill the cache
+    return timeit.timeit(load, number=NUMBER) / NUMBER * 1e3
+
+
+def main():
+    """Print results table."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cases = (
+            ('compile', measure(None)),
+            ('cached', measure(Path(cache_dir))),
+        )
+
+    print(f"{'bundles':<10}{'load, ms':>10}")
+    for name, elapsed in cases:
+        print(f'{name:<10}{elapsed:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Unit tests for the cache-aside decorator."""
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.cache.codec import JsonCodec
+from src.cache.decorators import cached
+from src.db.repositories.abstract import Repository
+
+
+class FakeCache:
+    """Cache kept in a dict."""
+
+    def __init__(self):
+        self.data: dict = {}
+
+    async def get(self, key: str):
+        return self.data.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int | None = None):
+        self.data[key] = value
+
+    async def delete(self, key: str):
+        self.data.pop(key, None)
+
+
+class FakeSession:
+    """Caller's session, only its bind is used by shared loads."""
+
+    def __init__(self, bind):
+        self.bind = bind
+
+
+class ItemRepo(Repository):
+    """Counts the queries a cached read runs."""
+
+    def __init__(self, session, cache, queries: list, release: asyncio.Event):
+        super().__init__(type_model=None, session=session, cache=cache)
+        self.queries = queries
+        self.release = release
+
+    @cached(key='item:{ident}', codec=JsonCodec())
+    async def get(self, ident: int) -> dict:
+        self.queries.append(self.session)
+        await self.release.wait()
+        return {'id': ident}
+
+    async def new(self, *args, **kwargs) -> None:
+        ...
+
+
+@pytest.fixture()
+def engine():
+    """Engine which never connects, loads don't run SQL here."""
+    return create_async_engine('postgresql+asyncpg://user@localhost/db')
+
+
+def make_repos(engine, count: int, cache: FakeCache, queries: list, release: asyncio.Event):
+    """One repository per caller, each in its own handler session."""
+    return [ItemRepo(FakeSession(engine), cache, queries, release) for _ in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_load_once(engine):
+    """Concurrent misses run one query, on a session which is no caller's."""
+    cache, queries, release = FakeCache(), [], asyncio.Event()
+    repos = make_repos(engine, 3, cache, queries, release)
+
+    calls = [asyncio.create_task(repo.get(1)) for repo in repos]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*calls) == [{'id': 1}] * 3
+    assert len(queries) == 1
+    assert queries[0] not in [repo.session for repo in repos]
+    assert 'item:1' in cache.data
+
+
+@pytest.mark.asyncio
+async def test_hit_runs_no_query(engine):
+    """Cached results are served without a query."""
+    cache, queries, release = FakeCache(), [], asyncio.Event()
+    repo, = make_repos(engine, 1, cache, queries, release)
+    release.set()
+    await repo.get(1)
+    queries.clear()
+
+    assert await repo.get(1) == {'id': 1}
+    assert not queries
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader(engine):
+    """Followers get the result when the caller which started the load is cancelled."""
+    cache, queries, release = FakeCache(), [], asyncio.Event()
+    leader, follower = make_repos(engine, 2, cache, queries, release)
+
+    first = asyncio.create_task(leader.get(1))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(follower.get(1))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == {'id': 1}
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert len(queries) == 1
+    assert 'item:1' in cache.data
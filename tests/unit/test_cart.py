@@ -0,0 +1,45 @@
+"""Unit tests for carts kept in Redis."""
+from types import SimpleNamespace
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from src.bot.logic.commands import get_cart_products
+from src.cache.cart import CartItem, CartStore
+
+
+class FakeProductRepo:
+    """Products by id, missing ids are deleted products."""
+
+    def __init__(self, products: dict):
+        self.products = products
+
+    async def get(self, ident: int):
+        return self.products.get(ident)
+
+
+@pytest.mark.asyncio
+async def test_remove():
+    """Removed products leave no fields behind."""
+    carts = CartStore(FakeAsyncRedis())
+    await carts.add(1, product_id=5, total_count=2, total_price=20)
+    await carts.add(1, product_id=7, total_count=1, total_price=15)
+
+    await carts.remove(1, 5)
+
+    assert await carts.get_items(1) == [CartItem(7, 1, 15)]
+
+
+@pytest.mark.asyncio
+async def test_deleted_products_are_dropped():
+    """A product deleted after it was put in the cart doesn't break the cart."""
+    cache = SimpleNamespace(cart=CartStore(FakeAsyncRedis()))
+    product = SimpleNamespace(id=7, product_name='Ruqiya suvi 19L')
+    db = SimpleNamespace(product=FakeProductRepo({7: product}))
+    await cache.cart.add(1, product_id=5, total_count=2, total_price=20)
+    await cache.cart.add(1, product_id=7, total_count=1, total_price=15)
+
+    cart_products = await get_cart_products(cache, db, 1)
+
+    assert cart_products == [(CartItem(7, 1, 15), product)]
+    assert await cache.cart.get_items(1) == [CartItem(7, 1, 15)]
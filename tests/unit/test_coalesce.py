@@ -0,0 +1,127 @@
+"""Unit tests for reads shared by concurrent callers."""
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.db.repositories import abstract
+from src.db.repositories.abstract import Repository, SharedSessions, coalesce
+
+
+class FakeSession:
+    """Caller's session, only its bind is used by shared loads."""
+
+    def __init__(self, bind):
+        self.bind = bind
+
+
+class CountingRepo(Repository):
+    """Counts the queries a coalesced read runs."""
+
+    def __init__(self, session, queries: list, release: asyncio.Event):
+        super().__init__(type_model=None, session=session)
+        self.queries = queries
+        self.release = release
+
+    @coalesce
+    async def get_items(self, page: int) -> list[int]:
+        self.queries.append((page, self.session))
+        await self.release.wait()
+        return [page, page + 1]
+
+    @coalesce
+    async def get_broken(self) -> int:
+        self.queries.append(None)
+        await self.release.wait()
+        raise ValueError('broken')
+
+    async def new(self, *args, **kwargs) -> None:
+        ...
+
+
+@pytest.fixture()
+def engine():
+    """Engine which never connects, shared loads don't run SQL here."""
+    return create_async_engine('postgresql+asyncpg://user@localhost/db')
+
+
+def make_repos(engine, count: int, queries: list, release: asyncio.Event) -> list[CountingRepo]:
+    """One repository per caller, each in its own handler session."""
+    return [CountingRepo(FakeSession(engine), queries, release) for _ in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_issue_one_query(engine):
+    """Identical reads run once, on a session which is no caller's."""
+    queries, release = [], asyncio.Event()
+    repos = make_repos(engine, 5, queries, release)
+
+    calls = [asyncio.create_task(repo.get_items(1)) for repo in repos]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*calls)
+
+    assert len(queries) == 1
+    assert queries[0][1] not in [repo.session for repo in repos]
+    assert results == [[1, 2]] * 5
+    assert len({id(result) for result in results}) == 5
+
+
+@pytest.mark.asyncio
+async def test_different_arguments_are_not_shared(engine):
+    """Reads with other arguments run their own query."""
+    queries, release = [], asyncio.Event()
+    first, second = make_repos(engine, 2, queries, release)
+    release.set()
+
+    assert await asyncio.gather(first.get_items(1), second.get_items(2)) == [[1, 2], [2, 3]]
+    assert len(queries) == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_sessions_are_bounded(engine, monkeypatch):
+    """No more shared sessions are open at once than the limit."""
+    monkeypatch.setattr(abstract, 'shared_sessions', SharedSessions(limit=2))
+    queries, release = [], asyncio.Event()
+    repos = make_repos(engine, 4, queries, release)
+
+    calls = [asyncio.create_task(repo.get_items(page)) for page, repo in enumerate(repos)]
+    await asyncio.sleep(0.01)
+
+    assert len(queries) == 2
+    release.set()
+    await asyncio.gather(*calls)
+    assert len(queries) == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader(engine):
+    """Followers get the result when the first caller is cancelled."""
+    queries, release = [], asyncio.Event()
+    leader, follower = make_repos(engine, 2, queries, release)
+
+    first = asyncio.create_task(leader.get_items(1))
+    second = asyncio.create_task(follower.get_items(1))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == [1, 2]
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert len(queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_caller(engine):
+    """A failed query fails every caller sharing it."""
+    queries, release = [], asyncio.Event()
+    repos = make_repos(engine, 3, queries, release)
+
+    calls = [asyncio.create_task(repo.get_broken()) for repo in repos]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert len(queries) == 1
@@ -0,0 +1,46 @@
+"""Unit tests for the main menu fast path."""
+import datetime
+
+import pytest
+from aiogram import Dispatcher, Router, types
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from src.bot.logic.menu import menu_router
+from src.bot.structures.fsm.order import OrderGroup
+from src.bot.utils.messages import default_languages
+from tests.utils.mocked_bot import MockedBot
+
+
+def make_update(text: str, user_id: int = 1) -> types.Update:
+    """Private text message update."""
+    return types.Update(update_id=1, message=types.Message(
+        message_id=1,
+        date=datetime.datetime.now(),
+        chat=types.Chat(id=user_id, type='private'),
+        from_user=types.User(id=user_id, is_bot=False, first_name='User'),
+        text=text,
+    ))
+
+
+@pytest.mark.asyncio
+async def test_menu_text_in_state_goes_to_state_handler():
+    """A menu text sent while a state waits for input isn't taken by the menu."""
+    bot = MockedBot()
+    storage = MemoryStorage()
+    received: list[str] = []
+
+    state_router = Router(name='state')
+
+    @state_router.message(OrderGroup.get_count)
+    async def get_count(message: types.Message):
+        received.append(message.text)
+
+    dp = Dispatcher(storage=storage)
+    dp.include_routers(menu_router, state_router)
+    key = StorageKey(bot_id=bot.id, chat_id=1, user_id=1)
+    await storage.set_state(key, OrderGroup.get_count)
+
+    await dp.feed_update(bot, make_update(default_languages['LATIN']['cart']))
+
+    assert received == [default_languages['LATIN']['cart']]
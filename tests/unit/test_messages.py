@@ -0,0 +1,25 @@
+"""Unit tests for message texts."""
+from decimal import Decimal
+
+from src.bot.utils.messages import get_sales_report_text
+from src.db.repositories.order import DistrictSales, HourSales
+
+
+def test_sales_report_without_hours():
+    """Districts and hours are cached apart, a report with no hours still renders."""
+    districts = [DistrictSales('Farg‘ona', 'Quva', 3, Decimal(90_000))]
+
+    text = get_sales_report_text([], districts, [], days=30, top=5)
+
+    assert 'Quva' in text
+
+
+def test_sales_report_hours_bars():
+    """The busiest hour gets the longest bar."""
+    districts = [DistrictSales('Farg‘ona', 'Quva', 3, Decimal(90_000))]
+    hours = [HourSales(9, 1, Decimal(30_000)), HourSales(18, 2, Decimal(60_000))]
+
+    text = get_sales_report_text([], districts, hours, days=30, top=5)
+
+    assert '09:00 ▇▇▇▇▇ 1' in text
+    assert '18:00 ▇▇▇▇▇▇▇▇▇▇ 2' in text
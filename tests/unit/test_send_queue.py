@@ -0,0 +1,148 @@
+"""Unit tests for the send queue middleware."""
+import asyncio
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import SendMessage
+
+from src.bot.middlewares import send_queue_md
+from src.bot.middlewares.send_queue_md import SendQueueMiddleware, TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock which only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch) -> FakeClock:
+    """Replace the clock of the send queue module."""
+    fake = FakeClock()
+    monkeypatch.setattr(send_queue_md.time, 'monotonic', fake)
+    return fake
+
+
+def test_reserve_within_burst(clock: FakeClock):
+    """Tokens of a full bucket are handed out without waiting."""
+    bucket = TokenBucket(rate=1, capacity=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+
+def test_reserve_over_burst(clock: FakeClock):
+    """Every reservation over the capacity waits one more token."""
+    bucket = TokenBucket(rate=2, capacity=1)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.5, 1.0]
+
+
+def test_reserve_refills(clock: FakeClock):
+    """Elapsed time refills the bucket up to its capacity."""
+    bucket = TokenBucket(rate=1, capacity=2)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.now += 10
+
+    assert bucket.idle
+    assert bucket.tokens == 2
+
+
+def test_penalize(clock: FakeClock):
+    """A penalized bucket releases nothing for the given delay."""
+    bucket = TokenBucket(rate=1, capacity=3)
+
+    bucket.penalize(5)
+
+    assert not bucket.idle
+    assert bucket.reserve() == 6.0
+    clock.now += 6
+    assert bucket.reserve() == 1.0
+
+
+def make_retry_after(method: SendMessage, retry_after: int = 0) -> TelegramRetryAfter:
+    """Flood control error as aiogram raises it."""
+    return TelegramRetryAfter(
+        method=method, message='Too Many Requests', retry_after=retry_after
+    )
+
+
+@pytest.mark.asyncio
+async def test_same_chat_order_with_retry():
+    """A flood controlled request holds back later requests of its chat."""
+    sent: list[str] = []
+    failed: set[str] = set()
+
+    async def make_request(bot, method: SendMessage):
+        sent.append(method.text)
+        if method.text == '1' and method.text not in failed:
+            failed.add(method.text)
+            raise make_retry_after(method)
+        return method.text
+
+    middleware = SendQueueMiddleware(
+        global_rate=1000, chat_rate=1000, group_rate=1000, burst=10, workers=4, max_retries=3
+    )
+    try:
+        results = await asyncio.wait_for(asyncio.gather(*(
+            middleware(make_request, None, SendMessage(chat_id=1, text=text))
+            for text in ('1', '2', '3')
+        )), timeout=5)
+    finally:
+        await middleware.close(timeout=0)
+
+    assert results == ['1', '2', '3']
+    assert sent == ['1', '1', '2', '3']
+    assert not middleware.chats
+
+
+@pytest.mark.asyncio
+async def test_other_chats_are_not_held_back():
+    """A flood controlled chat does not stop requests to other chats."""
+    sent: list[int] = []
+    release = asyncio.Event()
+
+    async def make_request(bot, method: SendMessage):
+        if method.chat_id == 1 and not release.is_set():
+            release.set()
+            raise make_retry_after(method, retry_after=1)
+        sent.append(method.chat_id)
+        return method.chat_id
+
+    middleware = SendQueueMiddleware(
+        global_rate=1000, chat_rate=1000, group_rate=1000, burst=10, workers=1, max_retries=3
+    )
+    try:
+        await asyncio.wait_for(asyncio.gather(
+            middleware(make_request, None, SendMessage(chat_id=1, text='first')),
+            middleware(make_request, None, SendMessage(chat_id=2, text='second')),
+        ), timeout=5)
+    finally:
+        await middleware.close(timeout=0)
+
+    assert sent == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_retries_exhausted():
+    """The flood control error is raised once retries run out."""
+    async def make_request(bot, method: SendMessage):
+        raise make_retry_after(method)
+
+    middleware = SendQueueMiddleware(
+        global_rate=1000, chat_rate=1000, group_rate=1000, burst=10, workers=1, max_retries=1
+    )
+    try:
+        with pytest.raises(TelegramRetryAfter):
+            await asyncio.wait_for(
+                middleware(make_request, None, SendMessage(chat_id=1, text='text')), timeout=5
+            )
+    finally:
+        await middleware.close(timeout=0)
+
+    assert not middleware.chats
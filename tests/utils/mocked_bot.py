@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING, Any
 from aiogram import Bot
 from aiogram.client.session.base import BaseSession
 from aiogram.methods import TelegramMethod
-from aiogram.methods.base import Request, Response, TelegramType
+from aiogram.methods.base import Response, TelegramType
 from aiogram.types import ResponseParameters, User
 from aiogram.types.base import UNSET
 
@@ -18,7 +18,7 @@ class MockedSession(BaseSession):
         """Mocked session is used for offline integration tests."""
         super().__init__()
         self.responses: deque[Response[TelegramType]] = deque()
-        self.requests: deque[Request] = deque()
+        self.requests: deque[TelegramMethod[Any]] = deque()
         self.closed = True
 
     def add_result(
@@ -32,10 +32,10 @@ class MockedSession(BaseSession):
         self.responses.append(response)
         return response
 
-    def get_request(self) -> Request:
+    def get_request(self) -> TelegramMethod[Any]:
         """Mocked method for get request.
 
-        :return: Request.
+        :return: Method which was sent.
         """
         return self.requests.pop()
 
@@ -60,16 +60,17 @@ class MockedSession(BaseSession):
         :return: The Result of request.
         """
         self.closed = False
-        self.requests.append(method.build_request(bot))
+        self.requests.append(method)
         try:
             response: Response[TelegramType] = self.responses.pop()
         except IndexError:
             return method
         else:
             self.check_response(
+                bot=bot,
                 method=method,
                 status_code=response.error_code,
-                content=response.model_dump('json'),
+                content=response.model_dump_json(),
             )
             return response.result  # type: ignore
 
@@ -141,15 +142,15 @@ class MockedBot(Bot):
         self.session.add_result(response)
         return response
 
-    def get_request(self) -> Request:
+    def get_request(self) -> TelegramMethod[Any]:
         """Get last request.
 
-        The get_request function returns a Request object that has been created
-        by the Session object. The get_request function is called when the user
+        The get_request function returns a TelegramMethod object that has been
+        sent through the Session object. The get_request function is called when the user
         wants to make a request to an endpoint.
 
         :param self: Access the class attributes and methods
-        :return: A request object
+        :return: A method object
         :doc-author: Trelent.
         """
         return self.session.get_request()